@@ -0,0 +1,162 @@
+import sys
+import re
+import json
+
+from edition_store import EditionStore, MISSING
+from quran_index import TOTAL_CHAPTERS, TOTAL_VERSES, CHAPTER_VERSE_COUNTS, global_to_verse, verse_to_global
+
+# ============================================================================
+# LOOKUP SETTINGS
+# ============================================================================
+MAX_REFERENCES = 500  # References accepted per batch request
+
+# "112", "2:255", "3:18-20", "2:285-3:5" or "1-3", separated by commas, semicolons or spaces;
+# (?!\d) keeps "2:2555" from matching as "2:255" followed by "5"
+REFERENCE_RE = re.compile(r'(\d{1,3})(?!\d)(?::(\d{1,3})(?!\d))?'
+                          r'(?:\s*[-–]\s*(\d{1,3})(?!\d)(?::(\d{1,3})(?!\d))?)?')
+SEPARATOR_RE = re.compile(r'[\s,;]+')
+
+
+def _global_index(chapter_no, verse_no, reference):
+    try:
+        return verse_to_global(chapter_no, verse_no)
+    except ValueError as e:
+        raise ValueError(f"{e} in reference '{reference}'") from None
+
+
+def parse_reference_match(match):
+    """Convert one REFERENCE_RE match into a global [start, stop) range"""
+    reference = match.group(0)
+    chapter, verse, end_a, end_b = match.groups()
+    chapter_no = int(chapter)
+
+    if verse is None:
+        # "112" or a chapter range "1-3"
+        last_chapter = int(end_a) if end_a is not None else chapter_no
+        if end_b is not None:
+            raise ValueError(f"Invalid reference '{reference}'")
+        if not 1 <= last_chapter <= TOTAL_CHAPTERS:
+            raise ValueError(f"Invalid chapter in reference '{reference}'")
+        start = _global_index(chapter_no, 1, reference)
+        stop = _global_index(last_chapter, CHAPTER_VERSE_COUNTS[last_chapter - 1], reference) + 1
+    else:
+        start = _global_index(chapter_no, int(verse), reference)
+        if end_a is None:
+            stop = start + 1
+        elif end_b is None:
+            # "3:18-20" stays inside the chapter
+            stop = _global_index(chapter_no, int(end_a), reference) + 1
+        else:
+            # "2:285-3:5" crosses chapters
+            stop = _global_index(int(end_a), int(end_b), reference) + 1
+
+    if stop <= start:
+        raise ValueError(f"Invalid range in reference '{reference}'")
+    return start, stop
+
+
+def parse_references(references):
+    """Parse mixed references into sorted, de-duplicated global ayah indexes
+
+    Accepts a string such as "2:255, 3:18-20, 112" or a list of such strings.
+    """
+    if isinstance(references, str):
+        references = [references]
+
+    selected = bytearray(TOTAL_VERSES)
+    count = 0
+    for text in references:
+        separator = SEPARATOR_RE.match(text)
+        position = separator.end() if separator else 0
+        while position < len(text):
+            match = REFERENCE_RE.match(text, position)
+            if not match:
+                raise ValueError(f"Cannot parse reference near '{text[position:position + 20]}'")
+            count += 1
+            if count > MAX_REFERENCES:
+                raise ValueError(f"Too many references (limit {MAX_REFERENCES})")
+            start, stop = parse_reference_match(match)
+            selected[start:stop] = b'\x01' * (stop - start)
+
+            # Each reference ends the text or is followed by a separator
+            position = match.end()
+            if position < len(text):
+                separator = SEPARATOR_RE.match(text, position)
+                if not separator:
+                    raise ValueError(f"Cannot parse reference near '{text[match.start():match.start() + 20]}'")
+                position = separator.end()
+
+    # Scanning the bitmap yields indexes already sorted and unique
+    return [index for index, flag in enumerate(selected) if flag]
+
+
+def index_runs(indexes):
+    """Group sorted indexes into contiguous (start, stop) runs"""
+    runs = []
+    for index in indexes:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return [(start, stop) for start, stop in runs]
+
+
+class BatchVerseLookup:
+    """Looks up many scattered verses from an EditionStore in one pass"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def lookup(self, references, tid, include_translation=True):
+        """Yield verses in the edition file format, in Quran order"""
+        return self.lookup_runs(index_runs(parse_references(references)), tid, include_translation)
+
+    def lookup_runs(self, runs, tid, include_translation=True):
+        """Yield verses for contiguous (start, stop) global index runs"""
+        edition = self.store.editions[tid]
+        tafsir_column = edition["column"]
+        trid = edition["meta"].get("trid")
+        translation = self.store.translations.get(trid) if include_translation else None
+
+        for start, stop in runs:
+            # Slice each run once per column instead of looking verses up one by one
+            tafsirs = tafsir_column.get_range(start, stop)
+            translations = translation["column"].get_range(start, stop) if translation else None
+
+            for offset, index in enumerate(range(start, stop)):
+                if tafsir_column.starts[index] == MISSING:
+                    continue
+                chapter_no, verse_no = global_to_verse(index)
+                verse = {
+                    "v": f"{chapter_no}:{verse_no}",
+                    "c": chapter_no,
+                    "n": verse_no,
+                    "tf": {"t": tafsirs[offset], "r": "", "id": tid},
+                    "tr": [],
+                }
+                if translations and translations[offset] is not None:
+                    verse["tr"].append(dict(translation["info"], t=translations[offset]))
+                yield verse
+
+    def stream_ndjson(self, references, tid, out=None, include_translation=True):
+        """Write one JSON line per verse, returning the number of lines"""
+        out = out or sys.stdout
+        lines = 0
+        for verse in self.lookup(references, tid, include_translation):
+            out.write(json.dumps(verse, ensure_ascii=False))
+            out.write("\n")
+            lines += 1
+        return lines
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print('Usage: python batch_verse_lookup.py TAFSIR_ID "2:255, 3:18-20, 112"')
+        sys.exit(1)
+
+    import edition_store
+    edition_store.SHOW_PROGRESS = False
+
+    store = EditionStore()
+    store.load_all()
+    BatchVerseLookup(store).stream_ndjson(sys.argv[2], int(sys.argv[1]))
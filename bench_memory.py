@@ -0,0 +1,78 @@
+import sys
+import json
+import os
+
+import edition_store
+from edition_store import EditionStore
+from import_memory_profile import MemoryProfiler
+
+# ============================================================================
+# BENCHMARK SETTINGS
+# ============================================================================
+REFERENCE_EDITION = "tafsir_english_817_Tazkirul_QuranMaulana_Wahidudd.json"
+BASELINE_FILE = "memory_baseline.json"
+TOLERANCE = 0.15  # Allowed growth of traced peak memory over the baseline
+
+
+def run_benchmark(path=REFERENCE_EDITION):
+    """Measure traced peak memory for loading the reference edition"""
+    profiler = MemoryProfiler(top_allocations=0)
+
+    with profiler.phase("json_load"):
+        with open(path, 'r', encoding='utf-8') as f:
+            edition = json.load(f)
+        del edition
+
+    edition_store.SHOW_PROGRESS = False
+    with profiler.phase("edition_store_load"):
+        store = EditionStore()
+        store.load_edition_file(path)
+        store.pool.freeze()
+
+    profiler.stop()
+    return {phase["phase"]: phase for phase in profiler.phases}, store.memory_footprint()
+
+
+def compare_with_baseline(results, baseline, tolerance=TOLERANCE):
+    """Return a list of phases whose traced peak regressed past the threshold"""
+    regressions = []
+    for name, phase in results.items():
+        expected = baseline.get("phases", {}).get(name)
+        if expected is None:
+            continue
+        limit = expected * (1 + tolerance)
+        if phase["traced_peak_delta_mb"] > limit:
+            regressions.append((name, phase["traced_peak_delta_mb"], expected, limit))
+    return regressions
+
+
+if __name__ == "__main__":
+    update = "--update" in sys.argv
+    results, footprint = run_benchmark()
+
+    print(f"🧠 Memory benchmark: {REFERENCE_EDITION}")
+    for name, phase in results.items():
+        rss = phase["peak_rss_mb"] if phase["peak_rss_mb"] is not None else phase["process_peak_rss_mb"]
+        print(f"   {name}: traced peak +{phase['traced_peak_delta_mb']} MB, peak RSS {rss} MB")
+    print(f"   edition_store footprint: {footprint['total_bytes']/1024/1024:.2f} MB")
+
+    if update or not os.path.exists(BASELINE_FILE):
+        baseline = {
+            "reference_edition": REFERENCE_EDITION,
+            "phases": {name: phase["traced_peak_delta_mb"] for name, phase in results.items()},
+        }
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"📄 Baseline saved: '{BASELINE_FILE}'")
+        sys.exit(0)
+
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline)
+    if regressions:
+        for name, measured, expected, limit in regressions:
+            print(f"❌ {name}: {measured} MB exceeds baseline {expected} MB (limit {limit:.2f} MB)")
+        sys.exit(1)
+
+    print(f"✅ Peak memory within {TOLERANCE*100:.0f}% of baseline")
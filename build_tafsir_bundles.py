@@ -0,0 +1,222 @@
+import sys
+import json
+import gzip
+import hashlib
+import glob
+import os
+from datetime import datetime
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ============================================================================
+# BUNDLE SETTINGS
+# ============================================================================
+EDITION_FILES_PATTERN = "tafsir_*.json"  # Edition files to split into shards
+BUNDLES_DIR = "bundles"  # Output directory, one sub-folder per edition
+MANIFEST_FILENAME = "manifest.json"
+USE_BROTLI = True  # Also write .br shards when the brotli module is installed
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+HASH_PREFIX_LENGTH = 12  # Hash characters embedded in shard file names
+SHOW_PROGRESS = True
+
+
+def load_edition(path):
+    """Load an edition file (meta / chs / vs)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def encode_json(data):
+    """Serialize JSON deterministically so unchanged shards keep their hash"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def split_edition_into_chapters(edition):
+    """Group edition verses by chapter number"""
+    chapters = {}
+    for verse_key, verse in edition.get("vs", {}).items():
+        chapters.setdefault(int(verse["c"]), {})[verse_key] = verse
+    return chapters
+
+
+def build_chapter_shard(edition, chapter_no, verses):
+    """Build the JSON payload for one chapter shard
+
+    Only chapter content goes in, so a version or date bump leaves unchanged
+    chapters with the same hash; those fields live in the manifest.
+    """
+    meta = edition.get("meta", {})
+    return {
+        "tid": meta.get("tid"),
+        "trid": meta.get("trid"),
+        "ch": edition.get("chs", {}).get(str(chapter_no), {"id": chapter_no}),
+        "vs": verses,
+    }
+
+
+def compress_gzip(raw):
+    """Gzip with a fixed mtime so identical input gives identical bytes"""
+    return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_brotli(raw):
+    """Brotli-compress shard bytes, or None when brotli is unavailable"""
+    if not (USE_BROTLI and brotli):
+        return None
+    return brotli.compress(raw, quality=BROTLI_QUALITY)
+
+
+def load_manifest(edition_dir):
+    """Load a previously written manifest, or None"""
+    manifest_path = os.path.join(edition_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"   ⚠️  Ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+
+
+def write_file(path, data):
+    """Write bytes atomically so CDNs never see a half-written shard"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def shard_is_current(edition_dir, previous_entry, sha256):
+    """Check that a shard with this hash is already on disk"""
+    if not previous_entry or previous_entry.get("sha256") != sha256:
+        return False
+    for key in ("file", "gzip", "br"):
+        name = previous_entry.get(key)
+        if name and not os.path.exists(os.path.join(edition_dir, name)):
+            return False
+    # Brotli was enabled since the last build
+    if compress_brotli(b"") is not None and not previous_entry.get("br"):
+        return False
+    return True
+
+
+def remove_stale_files(edition_dir, previous_entry, current_entry):
+    """Delete shard files from a previous build that are no longer referenced"""
+    if not previous_entry:
+        return
+    keep = {current_entry.get(key) for key in ("file", "gzip", "br")}
+    for key in ("file", "gzip", "br"):
+        name = previous_entry.get(key)
+        if name and name not in keep:
+            path = os.path.join(edition_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def build_edition_bundle(path, output_dir=BUNDLES_DIR):
+    """Split one edition into hashed, precompressed per-chapter shards"""
+    edition = load_edition(path)
+    edition_name = os.path.splitext(os.path.basename(path))[0]
+    edition_dir = os.path.join(output_dir, edition_name)
+    os.makedirs(edition_dir, exist_ok=True)
+
+    previous = load_manifest(edition_dir) or {}
+    previous_shards = {entry["chapter"]: entry for entry in previous.get("shards", [])}
+
+    shards = []
+    rebuilt = 0
+    for chapter_no, verses in sorted(split_edition_into_chapters(edition).items()):
+        raw = encode_json(build_chapter_shard(edition, chapter_no, verses))
+        sha256 = hashlib.sha256(raw).hexdigest()
+        previous_entry = previous_shards.get(chapter_no)
+
+        if shard_is_current(edition_dir, previous_entry, sha256):
+            shards.append(previous_entry)
+            continue
+
+        base_name = f"{chapter_no:03d}.{sha256[:HASH_PREFIX_LENGTH]}.json"
+        gz = compress_gzip(raw)
+        br = compress_brotli(raw)
+
+        write_file(os.path.join(edition_dir, base_name), raw)
+        write_file(os.path.join(edition_dir, f"{base_name}.gz"), gz)
+        if br is not None:
+            write_file(os.path.join(edition_dir, f"{base_name}.br"), br)
+
+        entry = {
+            "chapter": chapter_no,
+            "verses": len(verses),
+            "sha256": sha256,
+            "file": base_name,
+            "bytes": len(raw),
+            "gzip": f"{base_name}.gz",
+            "gzip_bytes": len(gz),
+        }
+        if br is not None:
+            entry["br"] = f"{base_name}.br"
+            entry["br_bytes"] = len(br)
+
+        remove_stale_files(edition_dir, previous_entry, entry)
+        shards.append(entry)
+        rebuilt += 1
+
+    meta = edition.get("meta", {})
+    manifest = {
+        "edition": edition_name,
+        "source": os.path.basename(path),
+        "tid": meta.get("tid"),
+        "tn": meta.get("tn"),
+        "lang": meta.get("lang"),
+        "trid": meta.get("trid"),
+        "v": meta.get("v"),
+        "date": meta.get("date"),
+        "generated_at": datetime.now().isoformat(),
+        "shard_count": len(shards),
+        "total_bytes": sum(entry["bytes"] for entry in shards),
+        "total_gzip_bytes": sum(entry["gzip_bytes"] for entry in shards),
+        "shards": shards,
+    }
+    if all("br_bytes" in entry for entry in shards) and shards:
+        manifest["total_br_bytes"] = sum(entry["br_bytes"] for entry in shards)
+
+    # Keep the manifest stable when nothing changed so it can be cached too
+    if rebuilt == 0 and previous.get("shards") == shards:
+        manifest["generated_at"] = previous.get("generated_at", manifest["generated_at"])
+
+    write_file(os.path.join(edition_dir, MANIFEST_FILENAME),
+               json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    if SHOW_PROGRESS:
+        print(f"   ✅ {edition_name}: {len(shards)} shards, {rebuilt} rebuilt "
+              f"({manifest['total_bytes']/1024/1024:.2f} MB raw, "
+              f"{manifest['total_gzip_bytes']/1024/1024:.2f} MB gzip)")
+
+    return manifest
+
+
+def build_all_bundles(pattern=EDITION_FILES_PATTERN, output_dir=BUNDLES_DIR):
+    """Build bundles for every edition file matching the pattern"""
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        print(f"❌ No edition files match '{pattern}'")
+        return []
+
+    print(f"📦 Building per-chapter bundles for {len(paths)} editions...")
+    if USE_BROTLI and not brotli:
+        print("   ⚠️  brotli module not installed, writing gzip shards only")
+
+    return [build_edition_bundle(path, output_dir) for path in paths]
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:]
+    if paths:
+        manifests = [build_edition_bundle(path) for path in paths]
+    else:
+        manifests = build_all_bundles()
+    print(f"🎉 Bundles written to '{BUNDLES_DIR}/' ({len(manifests)} editions)")
@@ -0,0 +1,286 @@
+import sys
+import json
+import glob
+import hashlib
+import os
+from array import array
+
+from quran_index import TOTAL_VERSES, verse_to_global, global_to_verse, global_to_verse_key
+
+# ============================================================================
+# STORE SETTINGS
+# ============================================================================
+EDITION_FILES_PATTERN = "tafsir_*.json"
+SHOW_PROGRESS = True
+
+MISSING = 0xFFFFFFFF  # Offset marker for verses an edition does not cover
+
+
+class StringPool:
+    """Interned UTF-8 text kept in one contiguous buffer"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._index = {}  # 8-byte digest -> (start, length) while loading
+        self.strings_added = 0
+
+    def add(self, text):
+        """Store text once and return its (start, length) in the buffer"""
+        self.strings_added += 1
+        if not text:
+            return 0, 0
+        return self.add_bytes(text.encode('utf-8'))
+
+    def add_bytes(self, data):
+        """Store already encoded text once and return its (start, length)"""
+        if not data:
+            return 0, 0
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+        found = self._index.get(digest)
+        if found is not None:
+            start, length = found
+            # Guard against digest collisions
+            if self.buffer[start:start + length] == data:
+                return found
+
+        start = len(self.buffer)
+        self.buffer += data
+        self._index[digest] = (start, len(data))
+        return start, len(data)
+
+    def get(self, start, length):
+        """Decode a string from the buffer"""
+        if not length:
+            return ""
+        return self.buffer[start:start + length].decode('utf-8')
+
+    def freeze(self):
+        """Drop the interning index once loading is finished"""
+        self._index = {}
+
+    def memory_bytes(self):
+        """Approximate bytes held by the pool"""
+        return sys.getsizeof(self.buffer) + sys.getsizeof(self._index)
+
+
+class TextColumn:
+    """Per-verse text offsets into a StringPool, indexed by global ayah"""
+
+    def __init__(self, pool, size=TOTAL_VERSES):
+        self.pool = pool
+        self.starts = array('I', [MISSING]) * size
+        self.lengths = array('I', [0]) * size
+        self.count = 0
+
+    def set(self, index, text):
+        """Set the text for one global ayah index"""
+        if self.starts[index] == MISSING:
+            self.count += 1
+        self.starts[index], self.lengths[index] = self.pool.add(text)
+
+    def has(self, index):
+        """Check whether the column covers a global ayah index"""
+        return self.starts[index] != MISSING
+
+    def get(self, index):
+        """Text for one global ayah index, or None if not covered"""
+        start = self.starts[index]
+        if start == MISSING:
+            return None
+        return self.pool.get(start, self.lengths[index])
+
+    def get_range(self, start, stop):
+        """Texts for global ayah indexes [start, stop) using array slices"""
+        buffer = self.pool.buffer
+        return [None if offset == MISSING else (buffer[offset:offset + length].decode('utf-8') if length else "")
+                for offset, length in zip(self.starts[start:stop], self.lengths[start:stop])]
+
+    def memory_bytes(self):
+        """Bytes held by the offset arrays (text lives in the pool)"""
+        return sys.getsizeof(self.starts) + sys.getsizeof(self.lengths)
+
+
+class EditionStore:
+    """All loaded editions, sharing translations by trid and text through one pool"""
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.editions = {}  # tid -> edition info and tafsir column
+        self.translations = {}  # trid -> translation info and text column
+        self.chapters = {}  # chapter number -> chapter name
+        self.content_hashes = {}  # tid -> sha256 of the source file
+
+    def load_edition_file(self, path):
+        """Load one edition file, reusing an already loaded translation
+
+        A translation is rebuilt when the file that first provided it is
+        loaded again, so reloading that file replaces its text.
+        """
+        with open(path, 'rb') as f:
+            raw = f.read()
+        edition = json.loads(raw)
+        meta = edition.get("meta", {})
+        tid = meta.get("tid")
+        trid = meta.get("trid")
+        source = os.path.basename(path)
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        for chapter_no, chapter in edition.get("chs", {}).items():
+            self.chapters.setdefault(int(chapter_no), sys.intern(chapter.get("n", "")))
+
+        tafsir_column = TextColumn(self.pool)
+        translation_column = None
+        translation_info = None
+        owner = self.translations.get(trid)
+        if trid is not None and (owner is None or owner["source"] == source):
+            translation_column = TextColumn(self.pool)
+
+        for verse in edition.get("vs", {}).values():
+            index = verse_to_global(int(verse["c"]), int(verse["n"]))
+            tafsir = verse.get("tf") or {}
+            tafsir_column.set(index, tafsir.get("t", ""))
+
+            if translation_column is not None:
+                for translation in verse.get("tr") or []:
+                    if translation.get("id") != trid:
+                        continue
+                    translation_column.set(index, translation.get("t", ""))
+                    if translation_info is None:
+                        translation_info = {
+                            "id": trid,
+                            "r": sys.intern(translation.get("r", "")),
+                            "l": sys.intern(translation.get("l", "")),
+                        }
+                    break
+
+        if translation_column is not None:
+            self.translations[trid] = {
+                "info": translation_info or {"id": trid, "r": "", "l": ""},
+                "column": translation_column,
+                "source": source,
+                "content_hash": content_hash,
+            }
+
+        self.editions[tid] = {
+            "meta": meta,
+            "source": source,
+            "column": tafsir_column,
+        }
+        self.content_hashes[tid] = content_hash
+
+        if SHOW_PROGRESS:
+            shared = " (shared translation)" if trid is not None and translation_column is None else ""
+            print(f"   ✅ Loaded {meta.get('tn', tid)}: {tafsir_column.count} verses{shared}")
+
+        return tid
+
+    def load_all(self, pattern=EDITION_FILES_PATTERN):
+        """Load every edition file matching the pattern"""
+        tids = [self.load_edition_file(path) for path in sorted(glob.glob(pattern))]
+        self.pool.freeze()
+        return tids
+
+    def reload_edition_file(self, path):
+        """Load a changed edition file again and drop the text it replaced"""
+        tid = self.load_edition_file(path)
+        self.compact()
+        return tid
+
+    def compact(self):
+        """Rebuild the pool with only the text the loaded columns still use
+
+        Replaced columns leave their text behind in the pool, and a frozen
+        pool no longer interns, so every reload would otherwise grow it.
+        """
+        pool = StringPool()
+        pool.strings_added = self.pool.strings_added
+        buffer = self.pool.buffer
+        columns = [edition["column"] for edition in self.editions.values()]
+        columns += [translation["column"] for translation in self.translations.values()]
+
+        rebuilt = []
+        for column in columns:
+            starts = array('I', column.starts)
+            lengths = array('I', column.lengths)
+            for index, (start, length) in enumerate(zip(column.starts, column.lengths)):
+                if start != MISSING:
+                    starts[index], lengths[index] = pool.add_bytes(bytes(buffer[start:start + length]))
+            rebuilt.append((column, starts, lengths))
+
+        pool.freeze()
+        for column, starts, lengths in rebuilt:
+            column.pool, column.starts, column.lengths = pool, starts, lengths
+        self.pool = pool
+
+    def get_tafsir(self, tid, index):
+        """Tafsir text of an edition for a global ayah index"""
+        return self.editions[tid]["column"].get(index)
+
+    def get_translation(self, trid, index):
+        """Translation text for a global ayah index"""
+        translation = self.translations.get(trid)
+        if not translation:
+            return None
+        return translation["column"].get(index)
+
+    def get_verse(self, tid, chapter_no, verse_no):
+        """Rebuild a verse in the edition file format"""
+        index = verse_to_global(chapter_no, verse_no)
+        return self.get_verse_by_index(tid, index)
+
+    def get_verse_by_index(self, tid, index):
+        """Rebuild a verse in the edition file format from a global ayah index"""
+        edition = self.editions[tid]
+        column = edition["column"]
+        if not column.has(index):
+            return None
+
+        chapter_no, verse_no = global_to_verse(index)
+        trid = edition["meta"].get("trid")
+        translations = []
+        if trid in self.translations:
+            text = self.translations[trid]["column"].get(index)
+            if text is not None:
+                translations.append(dict(self.translations[trid]["info"], t=text))
+
+        return {
+            "v": global_to_verse_key(index),
+            "c": chapter_no,
+            "n": verse_no,
+            "tf": {"t": column.get(index), "r": "", "id": tid},
+            "tr": translations,
+        }
+
+    def memory_footprint(self):
+        """Approximate bytes held by the store, broken down by part"""
+        tafsir_bytes = sum(edition["column"].memory_bytes() for edition in self.editions.values())
+        translation_bytes = sum(t["column"].memory_bytes() for t in self.translations.values())
+        pool_bytes = self.pool.memory_bytes()
+        return {
+            "editions": len(self.editions),
+            "translations": len(self.translations),
+            "strings_added": self.pool.strings_added,
+            "text_buffer_bytes": len(self.pool.buffer),
+            "pool_bytes": pool_bytes,
+            "tafsir_offset_bytes": tafsir_bytes,
+            "translation_offset_bytes": translation_bytes,
+            "total_bytes": pool_bytes + tafsir_bytes + translation_bytes,
+        }
+
+
+def print_memory_footprint(store):
+    """Print the memory footprint report"""
+    footprint = store.memory_footprint()
+    print("📊 Edition store memory footprint:")
+    print(f"   📚 Editions: {footprint['editions']} (translations loaded: {footprint['translations']})")
+    print(f"   🔤 Strings added: {footprint['strings_added']}")
+    print(f"   🧵 Text buffer: {footprint['text_buffer_bytes']/1024/1024:.2f} MB")
+    print(f"   📐 Offsets: {(footprint['tafsir_offset_bytes'] + footprint['translation_offset_bytes'])/1024:.1f} KB")
+    print(f"   💾 Total: {footprint['total_bytes']/1024/1024:.2f} MB")
+
+
+if __name__ == "__main__":
+    store = EditionStore()
+    pattern = sys.argv[1] if len(sys.argv) > 1 else EDITION_FILES_PATTERN
+    store.load_all(pattern)
+    print_memory_footprint(store)
@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ============================================================================
+# PROFILER SETTINGS
+# ============================================================================
+TOP_ALLOCATIONS = 5  # Source lines listed per phase in the report
+TRACEMALLOC_FRAMES = 1
+
+
+def current_rss_bytes():
+    """Current resident set size, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes():
+    """Peak resident set size since start or the last reset_peak_rss(), or None where unsupported"""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss():
+    """Reset the RSS high-water mark to the current RSS (Linux only)
+
+    Returns False where the peak cannot be reset, in which case
+    peak_rss_bytes() keeps reporting the process lifetime peak.
+    """
+    try:
+        with open("/proc/self/clear_refs", 'w') as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def to_mb(value):
+    return round(value / 1024 / 1024, 2) if value is not None else None
+
+
+class MemoryProfiler:
+    """Records tracemalloc and RSS high-water marks per named phase"""
+
+    def __init__(self, enabled=True, top_allocations=TOP_ALLOCATIONS):
+        self.enabled = enabled
+        self.top_allocations = top_allocations
+        self.phases = []
+        self.process_peak_rss = None  # Lifetime peak, kept across per-phase resets
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracemalloc unless something else already did"""
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        """Measure one phase; does nothing when the profiler is disabled"""
+        if not self.enabled:
+            yield
+            return
+
+        self.start()
+        tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        self._update_process_peak()
+        peak_reset = reset_peak_rss()
+        rss_before = current_rss_bytes()
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            phase_peak = self._update_process_peak()
+            record = {
+                "phase": name,
+                "seconds": round(time.time() - start_time, 2),
+                "traced_start_mb": to_mb(traced_before),
+                "traced_end_mb": to_mb(traced_after),
+                "traced_peak_mb": to_mb(traced_peak),
+                "traced_peak_delta_mb": to_mb(traced_peak - traced_before),
+                "rss_start_mb": to_mb(rss_before),
+                "rss_end_mb": to_mb(current_rss_bytes()),
+                # None where the high-water mark cannot be reset per phase
+                "peak_rss_mb": to_mb(phase_peak) if peak_reset else None,
+                "process_peak_rss_mb": to_mb(self.process_peak_rss),
+            }
+            if self.top_allocations:
+                stats = tracemalloc.take_snapshot().statistics("lineno")[:self.top_allocations]
+                record["top_allocations"] = [
+                    {"where": str(stat.traceback), "mb": to_mb(stat.size), "blocks": stat.count}
+                    for stat in stats
+                ]
+            self.phases.append(record)
+
+    def _update_process_peak(self):
+        """Fold the current high-water mark into process_peak_rss and return it"""
+        peak = peak_rss_bytes()
+        if peak is not None:
+            self.process_peak_rss = max(peak, self.process_peak_rss or 0)
+        return peak
+
+    def report(self):
+        """Phase records plus overall high-water marks, for the import report"""
+        if not self.enabled:
+            return None
+        self._update_process_peak()
+        return {
+            "phases": self.phases,
+            "max_traced_peak_mb": max((phase["traced_peak_mb"] for phase in self.phases), default=None),
+            "max_phase_peak_rss_mb": max((phase["peak_rss_mb"] for phase in self.phases
+                                          if phase["peak_rss_mb"] is not None), default=None),
+            "process_peak_rss_mb": to_mb(self.process_peak_rss),
+        }
+
+    def print_summary(self):
+        """Print one line per phase"""
+        if not self.enabled:
+            return
+        print("🧠 Memory profile:")
+        for phase in self.phases:
+            if phase["peak_rss_mb"] is not None:
+                rss = f", peak RSS {phase['peak_rss_mb']} MB"
+            elif phase["process_peak_rss_mb"] is not None:
+                rss = f", process peak RSS {phase['process_peak_rss_mb']} MB"
+            else:
+                rss = ""
+            print(f"   {phase['phase']}: traced peak {phase['traced_peak_mb']} MB "
+                  f"(+{phase['traced_peak_delta_mb']} MB){rss}, {phase['seconds']}s")
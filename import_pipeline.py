@@ -0,0 +1,175 @@
+import queue
+import threading
+
+# ============================================================================
+# PIPELINE SETTINGS
+# ============================================================================
+QUEUE_SIZE = 4  # Items buffered between stages before the upstream stage blocks
+POLL_INTERVAL = 0.5  # Seconds between stop checks while blocked on a queue
+WRITE_BATCH_SIZE = 1000  # Rows per commit for BatchWriter
+
+_END = object()  # Marks the end of the stream between stages
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline stage fails"""
+
+    def __init__(self, stage_name, error):
+        super().__init__(f"Stage '{stage_name}' failed: {error}")
+        self.stage_name = stage_name
+        self.error = error
+
+
+class Pipeline:
+    """Threaded producer -> stages -> consumer chain connected by bounded queues"""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.stop_event = threading.Event()
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def _fail(self, stage_name, error):
+        """Record a stage failure and tell every other stage to stop"""
+        with self._lock:
+            self.errors.append((stage_name, error))
+        self.stop_event.set()
+
+    def _put(self, out_queue, item):
+        """Put with backpressure, giving up once the pipeline is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                out_queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, in_queue):
+        """Get the next item, or _END once the pipeline is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                return in_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _run_producer(self, name, producer, out_queue):
+        try:
+            for item in producer():
+                if not self._put(out_queue, item):
+                    return
+            self._put(out_queue, _END)
+        except BaseException as e:
+            self._fail(name, e)
+
+    def _run_stage(self, name, func, in_queue, out_queue):
+        try:
+            while True:
+                item = self._get(in_queue)
+                if item is _END:
+                    self._put(out_queue, _END)
+                    return
+                if not self._put(out_queue, func(item)):
+                    return
+        except BaseException as e:
+            self._fail(name, e)
+
+    def _run_consumer(self, name, func, finish, in_queue):
+        try:
+            while True:
+                item = self._get(in_queue)
+                if item is _END:
+                    break
+                func(item)
+            # Only finish cleanly when nothing upstream failed
+            if finish and not self.stop_event.is_set():
+                finish()
+        except BaseException as e:
+            self._fail(name, e)
+
+    def run(self, producer, stages, consumer, finish=None):
+        """Run producer(), each (name, func) stage and consumer(item) until done
+
+        Raises PipelineError with the first failure after all threads stopped.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(stages) + 1)]
+        threads = [threading.Thread(target=self._run_producer, name="fetch",
+                                    args=("fetch", producer, queues[0]), daemon=True)]
+        for index, (name, func) in enumerate(stages):
+            threads.append(threading.Thread(target=self._run_stage, name=name,
+                                            args=(name, func, queues[index], queues[index + 1]),
+                                            daemon=True))
+        threads.append(threading.Thread(target=self._run_consumer, name="write",
+                                        args=("write", consumer, finish, queues[-1]), daemon=True))
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(POLL_INTERVAL)
+        except KeyboardInterrupt as e:
+            self._fail("main", e)
+            for thread in threads:
+                thread.join()
+
+        if self.errors:
+            stage_name, error = self.errors[0]
+            raise PipelineError(stage_name, error) from error
+
+
+class BatchWriter:
+    """Buffers rows for one INSERT statement and commits in size-based batches"""
+
+    def __init__(self, conn, sql, batch_size=WRITE_BATCH_SIZE, on_row_error=None):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.sql = sql
+        self.batch_size = batch_size
+        self.on_row_error = on_row_error
+        self.pending = []
+        self.rows_written = 0
+        self.commits = 0
+
+    def add(self, rows):
+        """Queue rows, flushing once a full batch is pending"""
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write and commit all pending rows"""
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        try:
+            self.cur.executemany(self.sql, rows)
+            self.rows_written += len(rows)
+        except Exception:
+            # Retry one by one so a single bad row does not drop the batch
+            self.conn.rollback()
+            for row in rows:
+                try:
+                    self.cur.execute(self.sql, row)
+                    self.rows_written += 1
+                except Exception as e:
+                    if self.on_row_error is None:
+                        raise
+                    self.on_row_error(row, e)
+        self.conn.commit()
+        self.commits += 1
+
+    def close(self):
+        """Flush remaining rows and release the cursor"""
+        try:
+            self.flush()
+        finally:
+            self.release()
+
+    def release(self):
+        """Release the cursor without writing pending rows; safe to call twice"""
+        self.pending = []
+        if self.cur is not None:
+            self.cur.close()
+            self.cur = None
@@ -0,0 +1,111 @@
+import zlib
+
+# ============================================================================
+# VERIFICATION SETTINGS
+# ============================================================================
+INDEX_NAME = "idx_quran_translations_code_chapter"
+CHECKSUM_SEPARATOR = "|"
+
+# One pass over the edition's rows, grouped per chapter. The checksum matches
+# row_checksum(): CRC32 of "verse_no|translation|footnote" in UTF-8, summed
+# per chapter so duplicate rows do not cancel out.
+VERIFY_QUERY = '''SELECT chapter_no,
+                         COUNT(*),
+                         SUM(translation IS NOT NULL AND translation != ''),
+                         SUM(footnote IS NOT NULL AND footnote != ''),
+                         SUM(CRC32(CONCAT_WS('|', verse_no, translation, footnote)))
+                  FROM quran_translations
+                  WHERE translation_code = %s
+                  GROUP BY chapter_no'''
+
+
+def row_checksum(verse_no, translation, footnote):
+    """CRC32 of one row, computed the same way as VERIFY_QUERY"""
+    parts = [str(verse_no)] + [part for part in (translation, footnote) if part is not None]
+    return zlib.crc32(CHECKSUM_SEPARATOR.join(parts).encode('utf-8'))
+
+
+class ChapterChecksums:
+    """Per-chapter expectations accumulated while rows are written"""
+
+    def __init__(self):
+        self.chapters = {}
+
+    def add(self, chapter_no, verse_no, translation, footnote):
+        """Account for one row that is being written"""
+        chapter = self.chapters.setdefault(chapter_no, {
+            "rows": 0, "translations": 0, "footnotes": 0, "checksum": 0,
+        })
+        chapter["rows"] += 1
+        chapter["translations"] += 1 if translation else 0
+        chapter["footnotes"] += 1 if footnote else 0
+        chapter["checksum"] += row_checksum(verse_no, translation, footnote)
+
+    def remove(self, chapter_no, verse_no, translation, footnote):
+        """Undo add() for a row that failed to insert"""
+        chapter = self.chapters.get(chapter_no)
+        if not chapter:
+            return
+        chapter["rows"] -= 1
+        chapter["translations"] -= 1 if translation else 0
+        chapter["footnotes"] -= 1 if footnote else 0
+        chapter["checksum"] -= row_checksum(verse_no, translation, footnote)
+
+    def to_dict(self):
+        return {str(chapter_no): dict(values) for chapter_no, values in sorted(self.chapters.items())}
+
+
+def ensure_translation_code_index(conn):
+    """Create a (translation_code, chapter_no) index if translation_code is not indexed yet"""
+    cur = conn.cursor()
+    try:
+        cur.execute("SHOW INDEX FROM quran_translations WHERE Column_name = 'translation_code' AND Seq_in_index = 1")
+        if cur.fetchall():
+            return False
+        cur.execute(f"CREATE INDEX {INDEX_NAME} ON quran_translations (translation_code, chapter_no)")
+        conn.commit()
+        return True
+    finally:
+        cur.close()
+
+
+def verify_import(conn, translation_code, expected=None):
+    """Aggregate counts and checksums in one query and compare with the import"""
+    cur = conn.cursor()
+    try:
+        cur.execute(VERIFY_QUERY, (translation_code,))
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    stored = {}
+    for chapter_no, row_count, translation_count, footnote_count, checksum in rows:
+        stored[int(chapter_no)] = {
+            "rows": int(row_count),
+            "translations": int(translation_count or 0),
+            "footnotes": int(footnote_count or 0),
+            "checksum": int(checksum or 0),
+        }
+
+    result = {
+        "total_chapters": len(stored),
+        "total_verses": sum(chapter["rows"] for chapter in stored.values()),
+        "translation_count": sum(chapter["translations"] for chapter in stored.values()),
+        "footnote_count": sum(chapter["footnotes"] for chapter in stored.values()),
+        "checksums_compared": expected is not None,
+        "mismatched_chapters": [],
+        "verified": None,
+    }
+
+    if expected is not None:
+        expected_chapters = expected.chapters if isinstance(expected, ChapterChecksums) else expected
+        mismatched = []
+        for chapter_no in sorted(set(expected_chapters) | set(stored)):
+            want = expected_chapters.get(chapter_no)
+            have = stored.get(chapter_no)
+            if want != have:
+                mismatched.append({"chapter": chapter_no, "expected": want, "stored": have})
+        result["mismatched_chapters"] = mismatched
+        result["verified"] = not mismatched
+
+    return result
@@ -0,0 +1,159 @@
+import sys
+import json
+import os
+import hashlib
+import threading
+import zipfile
+from datetime import datetime
+
+# ============================================================================
+# SNAPSHOT SETTINGS
+# ============================================================================
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_COMPRESSION = zipfile.ZIP_LZMA  # Best ratio for repetitive JSON pages
+INDEX_NAME = "index.json"
+CDN_KEY_PREFIX = "cdn:"  # Keys for CDN tafsir files, independent of the mirror used
+
+
+def entry_name(key):
+    """Archive member name for a URL or logical key"""
+    return f"data/{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def cdn_key(tafsir_id):
+    """Snapshot key for a CDN tafsir file"""
+    return f"{CDN_KEY_PREFIX}{tafsir_id}"
+
+
+class SnapshotResponse:
+    """Minimal stand-in for requests.Response served from a snapshot"""
+
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class SnapshotWriter:
+    """Collects responses during a capture run and writes one compressed archive"""
+
+    def __init__(self, path, info=None):
+        self.path = path
+        self.info = info or {}
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, content):
+        """Store the body for a URL or logical key (first capture wins)"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        with self._lock:
+            self.entries.setdefault(key, content)
+
+    def record_json(self, key, data):
+        """Store parsed JSON under a key"""
+        self.record(key, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    def has(self, key):
+        with self._lock:
+            return key in self.entries
+
+    def save(self):
+        """Write all captured entries and the index into the archive"""
+        with self._lock:
+            entries = dict(self.entries)
+
+        index = {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "info": self.info,
+            "entries": {key: {"name": entry_name(key), "bytes": len(content),
+                              "sha256": hashlib.sha256(content).hexdigest()}
+                        for key, content in sorted(entries.items())},
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with zipfile.ZipFile(tmp_path, 'w', compression=SNAPSHOT_COMPRESSION) as archive:
+            for key, content in sorted(entries.items()):
+                archive.writestr(entry_name(key), content)
+            archive.writestr(INDEX_NAME, json.dumps(index, ensure_ascii=False, indent=2))
+
+        os.replace(tmp_path, self.path)
+        return index
+
+
+class SnapshotReader:
+    """Serves captured responses from a snapshot archive without network access"""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'r')
+        self.index = json.loads(self.archive.read(INDEX_NAME))
+        self.entries = self.index.get("entries", {})
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def info(self):
+        return self.index.get("info", {})
+
+    def has(self, key):
+        return key in self.entries
+
+    def read(self, key):
+        """Raw bytes for a key, or None if it was not captured"""
+        entry = self.entries.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # ZipFile reads are not safe across threads on one handle
+            return self.archive.read(entry["name"])
+
+    def read_json(self, key):
+        """Parsed JSON for a key, or None"""
+        content = self.read(key)
+        return json.loads(content) if content is not None else None
+
+    def response(self, url):
+        """A SnapshotResponse for a URL, or None if it was not captured"""
+        content = self.read(url)
+        return SnapshotResponse(url, content) if content is not None else None
+
+    def close(self):
+        self.archive.close()
+
+
+def print_snapshot_summary(path):
+    """Print what a snapshot archive contains"""
+    reader = SnapshotReader(path)
+    entries = reader.entries
+    cdn_entries = [key for key in entries if key.startswith(CDN_KEY_PREFIX)]
+    chapter_entries = [key for key in entries if "/verses/by_chapter/" in key]
+    ayah_entries = [key for key in entries if "/by_ayah/" in key]
+
+    print(f"📦 Snapshot: {path}")
+    print(f"   📅 Created: {reader.index.get('created_at')}")
+    for key, value in reader.info.items():
+        print(f"   🏷️  {key}: {value}")
+    print(f"   📚 CDN tafsir files: {len(cdn_entries)}")
+    print(f"   📖 Chapter pages: {len(chapter_entries)}")
+    print(f"   🔎 by_ayah fallbacks: {len(ayah_entries)}")
+    print(f"   💾 Uncompressed: {sum(e['bytes'] for e in entries.values())/1024/1024:.2f} MB")
+    reader.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python offline_snapshot.py SNAPSHOT.zip")
+        sys.exit(1)
+    print_snapshot_summary(sys.argv[1])
@@ -0,0 +1,61 @@
+import bisect
+
+# Verse counts for all 114 chapters, in chapter order
+CHAPTER_VERSE_COUNTS = [
+    7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128, 111, 110, 98, 135,
+    112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73, 54, 45, 83, 182, 88, 75, 85,
+    54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60, 49, 62, 55, 78, 96, 29, 22, 24, 13,
+    14, 11, 11, 18, 12, 12, 30, 52, 52, 44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42,
+    29, 19, 36, 25, 22, 17, 19, 26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11,
+    11, 8, 3, 9, 5, 4, 7, 3, 6, 3, 5, 4, 5, 6
+]
+
+TOTAL_CHAPTERS = len(CHAPTER_VERSE_COUNTS)
+TOTAL_VERSES = sum(CHAPTER_VERSE_COUNTS)  # 6236
+
+# Global index of the first verse of each chapter (index 0 is chapter 1)
+CHAPTER_OFFSETS = []
+_offset = 0
+for _count in CHAPTER_VERSE_COUNTS:
+    CHAPTER_OFFSETS.append(_offset)
+    _offset += _count
+
+
+def is_valid_verse(chapter_no, verse_no):
+    """Check that a chapter/verse pair exists"""
+    return 1 <= chapter_no <= TOTAL_CHAPTERS and 1 <= verse_no <= CHAPTER_VERSE_COUNTS[chapter_no - 1]
+
+
+def verse_to_global(chapter_no, verse_no):
+    """Convert chapter/verse numbers into a 0-based global ayah index"""
+    if not is_valid_verse(chapter_no, verse_no):
+        raise ValueError(f"Invalid verse {chapter_no}:{verse_no}")
+    return CHAPTER_OFFSETS[chapter_no - 1] + verse_no - 1
+
+
+def global_to_verse(index):
+    """Convert a 0-based global ayah index back into (chapter_no, verse_no)"""
+    if not 0 <= index < TOTAL_VERSES:
+        raise ValueError(f"Invalid global ayah index {index}")
+    chapter_index = bisect.bisect_right(CHAPTER_OFFSETS, index) - 1
+    return chapter_index + 1, index - CHAPTER_OFFSETS[chapter_index] + 1
+
+
+def verse_key_to_global(verse_key):
+    """Convert a "c:n" verse key into a global ayah index"""
+    chapter_no, verse_no = verse_key.split(":")
+    return verse_to_global(int(chapter_no), int(verse_no))
+
+
+def global_to_verse_key(index):
+    """Convert a global ayah index into a "c:n" verse key"""
+    chapter_no, verse_no = global_to_verse(index)
+    return f"{chapter_no}:{verse_no}"
+
+
+def chapter_range(chapter_no):
+    """Global index range (start, stop) covering a whole chapter"""
+    if not 1 <= chapter_no <= TOTAL_CHAPTERS:
+        raise ValueError(f"Invalid chapter {chapter_no}")
+    start = CHAPTER_OFFSETS[chapter_no - 1]
+    return start, start + CHAPTER_VERSE_COUNTS[chapter_no - 1]
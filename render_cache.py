@@ -0,0 +1,227 @@
+import sys
+import json
+import threading
+from collections import OrderedDict
+
+from edition_store import EditionStore
+from batch_verse_lookup import BatchVerseLookup, parse_references, index_runs
+from tafsir_text_normalizer import verse_to_row
+
+# ============================================================================
+# CACHE SETTINGS
+# ============================================================================
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Total rendered bytes kept in memory
+CACHE_POLICY = "lru"  # "lru" or "lfu"
+OUTPUT_FORMATS = ("combined", "json", "text", "ndjson")
+
+
+class RenderCache:
+    """Rendered documents bounded by total bytes, evicted by LRU or LFU"""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, policy=CACHE_POLICY):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache policy '{policy}'")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.entries = OrderedDict()  # key -> [value, size, content_hash, uses]
+        self.buckets = {}  # LFU: uses -> OrderedDict of keys, least recent first
+        self.min_uses = 0
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, content_hash):
+        """Cached value for key, or None on a miss or a stale content hash"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[2] != content_hash:
+                if entry is not None:
+                    self._remove(key)
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            self._touch(key, entry)
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, content_hash, value, size):
+        """Store a value; values larger than the whole cache are not kept"""
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = [value, size, content_hash, 1]
+            if self.policy == "lfu":
+                self.buckets.setdefault(1, OrderedDict())[key] = None
+                self.min_uses = 1
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self._remove(self._victim())
+                self.evictions += 1
+        return True
+
+    def _touch(self, key, entry):
+        uses = entry[3]
+        entry[3] += 1
+        if self.policy != "lfu":
+            return
+        self._unbucket(key, uses)
+        self.buckets.setdefault(uses + 1, OrderedDict())[key] = None
+        if self.min_uses == uses and uses not in self.buckets:
+            self.min_uses = uses + 1
+
+    def _unbucket(self, key, uses):
+        bucket = self.buckets[uses]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[uses]
+
+    def _victim(self):
+        if self.policy == "lru":
+            return next(iter(self.entries))
+        # Least used first; ties go to the least recently used
+        if self.min_uses not in self.buckets:
+            # Only after the last key with the fewest uses was removed
+            self.min_uses = min(self.buckets)
+        return next(iter(self.buckets[self.min_uses]))
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.current_bytes -= entry[1]
+        if self.policy == "lfu":
+            self._unbucket(key, entry[3])
+
+    def invalidate(self, edition, content_hash=None):
+        """Drop an edition's entries, or only those not matching content_hash"""
+        with self._lock:
+            stale = [key for key, entry in self.entries.items()
+                     if key[0] == edition and entry[2] != content_hash]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.buckets.clear()
+            self.min_uses = 0
+            self.current_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def render_verses(verses, tafsir_id, output_format):
+    """Render verses from the edition store in one of OUTPUT_FORMATS"""
+    if output_format == "combined":
+        # Same layout the importer writes to quran_translations.footnote
+        parts = []
+        for verse in verses:
+            translation_text, footnote = verse_to_row(verse, tafsir_id)
+            parts.append(f"[{verse['v']}] {translation_text}\n{footnote}")
+        return "\n\n".join(parts)
+
+    if output_format == "text":
+        parts = []
+        for verse in verses:
+            translations = verse.get("tr") or []
+            lines = [f"[{verse['v']}]"]
+            if translations:
+                lines.append(translations[0]["t"])
+            if verse["tf"]["t"]:
+                lines.append(verse["tf"]["t"])
+            parts.append("\n".join(lines))
+        return "\n\n".join(parts)
+
+    documents = [{
+        "v": verse["v"],
+        "translation": verse["tr"][0]["t"] if verse.get("tr") else "",
+        "tafsir": verse["tf"]["t"],
+        "tafsir_id": verse["tf"]["id"],
+    } for verse in verses]
+
+    if output_format == "json":
+        return json.dumps(documents, ensure_ascii=False)
+    if output_format == "ndjson":
+        return "".join(json.dumps(document, ensure_ascii=False) + "\n" for document in documents)
+
+    raise ValueError(f"Unknown output format '{output_format}' (expected one of {OUTPUT_FORMATS})")
+
+
+class CachedRenderer:
+    """Serves rendered verse ranges from a RenderCache keyed by edition content hash"""
+
+    def __init__(self, store, cache=None):
+        self.store = store
+        self.lookup = BatchVerseLookup(store)
+        self.cache = cache or RenderCache()
+
+    def render(self, tid, references, output_format="combined"):
+        """Rendered document for references such as "1:1-7" or "2:255, 78-114" """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}' (expected one of {OUTPUT_FORMATS})")
+
+        # Normalize the range so "1:1-7" and "1:1-1:7" share one entry
+        runs = tuple(index_runs(parse_references(references)))
+        key = (tid, runs, output_format)
+        content_hash = self.content_hash(tid)
+
+        document = self.cache.get(key, content_hash)
+        if document is not None:
+            return document
+
+        document = render_verses(list(self.lookup.lookup_runs(runs, tid)), tid, output_format)
+        self.cache.put(key, content_hash, document, len(document.encode('utf-8')))
+        return document
+
+    def content_hash(self, tid):
+        """Hash of everything an edition renders from: its file and its translation's file"""
+        trid = self.store.editions[tid]["meta"].get("trid")
+        translation = self.store.translations.get(trid)
+        return (self.store.content_hashes.get(tid),
+                translation["content_hash"] if translation else None)
+
+    def reload_edition(self, path):
+        """Reload an edition file and drop cache entries rendered from its old content
+
+        Editions sharing a translation the file provides are invalidated too.
+        """
+        tid = self.store.reload_edition_file(path)
+        trid = self.store.editions[tid]["meta"].get("trid")
+        for other_tid, edition in self.store.editions.items():
+            if other_tid == tid or (trid is not None and edition["meta"].get("trid") == trid):
+                self.cache.invalidate(other_tid, self.content_hash(other_tid))
+        return tid
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print('Usage: python render_cache.py TAFSIR_ID "1:1-7, 2:255" [FORMAT]')
+        sys.exit(1)
+
+    import edition_store
+    edition_store.SHOW_PROGRESS = False
+
+    store = EditionStore()
+    store.load_all()
+    renderer = CachedRenderer(store)
+    output_format = sys.argv[3] if len(sys.argv) > 3 else "combined"
+    print(renderer.render(int(sys.argv[1]), sys.argv[2], output_format))
@@ -0,0 +1,129 @@
+import sys
+import json
+
+from edition_store import EditionStore, TextColumn
+from quran_index import TOTAL_VERSES, verse_to_global, verse_key_to_global, global_to_verse_key
+from tafsir_text_normalizer import split_combined_footnote
+from batch_verse_lookup import parse_references, index_runs
+
+# ============================================================================
+# QUERY SETTINGS
+# ============================================================================
+MAX_QUERY_VERSES = TOTAL_VERSES  # Largest range a single query may return
+NDJSON_CHUNK_VERSES = 256  # Verses sliced per column at a time when streaming
+
+
+class SideBySideTable:
+    """Editions as text columns over the shared global-ayah axis"""
+
+    def __init__(self, store=None):
+        self.store = store or EditionStore()
+        self.columns = {}  # column name -> TextColumn
+
+    def add_column(self, name, column):
+        """Register a TextColumn under a name"""
+        self.columns[name] = column
+
+    def add_store_columns(self):
+        """Expose every loaded tafsir as "tafsir:<tid>" and translation as "translation:<trid>" """
+        for tid, edition in self.store.editions.items():
+            self.add_column(f"tafsir:{tid}", edition["column"])
+        for trid, translation in self.store.translations.items():
+            self.add_column(f"translation:{trid}", translation["column"])
+        return sorted(self.columns)
+
+    def load_database_column(self, conn, translation_code, field="tafsir", name=None):
+        """Load one imported edition from quran_translations as a column
+
+        field is "translation", "tafsir" or "footnotes"; the last two are split
+        out of the importer's combined footnote column.
+        """
+        column = TextColumn(self.store.pool)
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "SELECT chapter_no, verse_no, translation, footnote FROM quran_translations WHERE translation_code = %s",
+                (translation_code,)
+            )
+            for chapter_no, verse_no, translation, footnote in cur.fetchall():
+                index = verse_to_global(int(chapter_no), int(verse_no))
+                if field == "translation":
+                    column.set(index, translation or "")
+                else:
+                    footnotes, _, tafsir_text = split_combined_footnote(footnote or "")
+                    column.set(index, tafsir_text if field == "tafsir" else footnotes)
+        finally:
+            cur.close()
+
+        name = name or f"{translation_code}:{field}"
+        self.add_column(name, column)
+        return name
+
+    def _resolve(self, names):
+        missing = [name for name in names if name not in self.columns]
+        if missing:
+            raise KeyError(f"Unknown columns: {missing} (available: {sorted(self.columns)})")
+        return [self.columns[name] for name in names]
+
+    def query(self, names, start, stop):
+        """Return N columns x M verses for global indexes [start, stop) in one call"""
+        columns = self._resolve(names)
+        start, stop = max(0, start), min(TOTAL_VERSES, stop)
+        if stop - start > MAX_QUERY_VERSES:
+            raise ValueError(f"Range of {stop - start} verses exceeds MAX_QUERY_VERSES")
+
+        return {
+            "verses": [global_to_verse_key(index) for index in range(start, stop)],
+            "columns": {name: column.get_range(start, stop) for name, column in zip(names, columns)},
+        }
+
+    def query_keys(self, names, first_key, last_key):
+        """query() for an inclusive "c:n" .. "c:n" range"""
+        return self.query(names, verse_key_to_global(first_key), verse_key_to_global(last_key) + 1)
+
+    def iter_rows(self, names, start, stop, chunk_size=NDJSON_CHUNK_VERSES):
+        """Yield one dict per verse, slicing the columns chunk by chunk"""
+        start, stop = max(0, start), min(TOTAL_VERSES, stop)
+        for chunk_start in range(start, stop, chunk_size):
+            chunk = self.query(names, chunk_start, min(stop, chunk_start + chunk_size))
+            texts = [chunk["columns"][name] for name in names]
+            for offset, verse_key in enumerate(chunk["verses"]):
+                row = {"v": verse_key}
+                for name, column_texts in zip(names, texts):
+                    row[name] = column_texts[offset]
+                yield row
+
+    def stream_ndjson(self, names, start, stop, out=None):
+        """Write one JSON line per verse, returning the number of lines"""
+        out = out or sys.stdout
+        lines = 0
+        for row in self.iter_rows(names, start, stop):
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+            lines += 1
+        return lines
+
+
+def parse_range(text):
+    """Parse "2:1-2:20", "2:1-20", "2:255" or "112" into global [start, stop)"""
+    runs = index_runs(parse_references(text))
+    if len(runs) != 1:
+        raise ValueError(f"Expected one contiguous range, got '{text}'")
+    return runs[0]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python side_by_side_query.py RANGE COLUMN [COLUMN ...]")
+        print("   e.g. python side_by_side_query.py 2:1-2:20 tafsir:817 translation:20 tafsir:16")
+        sys.exit(1)
+
+    import edition_store
+    edition_store.SHOW_PROGRESS = False
+
+    table = SideBySideTable()
+    table.store.load_all()
+    table.add_store_columns()
+
+    start, stop = parse_range(sys.argv[1])
+    table.stream_ndjson(sys.argv[2:], start, stop)
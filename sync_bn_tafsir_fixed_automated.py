@@ -7,9 +7,12 @@ import os
 from datetime import datetime
 import random
 
-# Set UTF-8 encoding for console output
+from tafsir_text_normalizer import NormalizationStage
+from import_pipeline import Pipeline, PipelineError, BatchWriter
+from offline_snapshot import SnapshotReader, SnapshotWriter, cdn_key
+from import_verification import ChapterChecksums, ensure_translation_code_index, verify_import
+from import_memory_profile import MemoryProfiler
 import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 # ============================================================================
 # CONFIGURATION SECTION - CHANGE THESE VALUES TO IMPORT DIFFERENT EDITIONS
@@ -170,6 +173,18 @@ AUTO_CONFIRM = True  # Set to True to run without user confirmation
 SHOW_PROGRESS = True  # Set to False to reduce console output
 USE_CDN_FALLBACK = True  # Try CDN sources but don't fail if unavailable
 RETRY_ATTEMPTS = 3  # Number of retry attempts for failed requests
+PIPELINE_QUEUE_SIZE = 4  # Chapters buffered between fetch, assemble and write stages
+WRITE_BATCH_SIZE = 1000  # Rows per database commit
+NORMALIZE_TEXT = False  # Strip HTML/footnote markers from text before storing (runs in a process pool)
+# With NORMALIZE_TEXT, search forms and footnote markers go to this NDJSON file
+# (quran_translations has no columns for them)
+SEARCH_INDEX_FILE = None  # Defaults to <edition>_search.ndjson
+
+# Offline mirror: "build" captures everything the import needs into SNAPSHOT_FILE
+# (no database needed), "replay" imports from SNAPSHOT_FILE without network access
+SNAPSHOT_MODE = None  # None, "build" or "replay"
+SNAPSHOT_FILE = None  # Defaults to snapshot_<edition>.zip
+PROFILE_MEMORY = False  # Record tracemalloc/peak RSS per phase in the import report (slows the import)
 
 # ============================================================================
 # MAIN CONFIGURATION (Auto-populated from selected edition)
@@ -187,6 +202,21 @@ authorName = edition_config["author"]
 primaryTafsirId = edition_config["tafsir_id"]
 translationId = edition_config["translation_id"]
 fallbackTafsirIds = edition_config["fallback_tafsir_ids"]
+snapshotFile = SNAPSHOT_FILE or f"snapshot_{EDITION_TO_IMPORT}.zip"
+searchIndexFile = SEARCH_INDEX_FILE or f"{EDITION_TO_IMPORT}_search.ndjson"
+
+if SNAPSHOT_MODE not in (None, "build", "replay"):
+    print(f"❌ Error: Unknown SNAPSHOT_MODE '{SNAPSHOT_MODE}'")
+    sys.exit(1)
+
+# Active snapshot (SnapshotWriter when building, SnapshotReader when replaying)
+snapshot = None
+
+# Per-chapter checksums of the rows written by the last import
+import_checksums = None
+
+# Per-phase memory high-water marks (no-op unless PROFILE_MEMORY is set)
+memory_profiler = MemoryProfiler(enabled=PROFILE_MEMORY)
 
 # API Configuration
 baseUrl = "https://api.quran.com/api/v4"
@@ -200,21 +230,30 @@ cdn_sources = [
     "https://gitcdn.xyz/repo/spa5k/tafsir_api/main/tafsir/"
 ]
 
-# Database connection with proper encoding
-try:
-    conn = mysql.connector.connect(
-        user='root', 
-        password='123456', 
-        host='127.0.0.1', 
-        database='quran_api',
-        charset='utf8mb4',
-        collation='utf8mb4_unicode_ci'
-    )
-    cur = conn.cursor()
-    print("✅ Database connection established")
-except Exception as e:
-    print(f"❌ Database connection failed: {e}")
-    sys.exit(1)
+# Database connection, opened by connect_database() when run as a script so
+# that normalizer worker processes re-importing this module stay offline
+conn = None
+cur = None
+
+def connect_database():
+    """Open the database connection with proper encoding"""
+    global conn, cur
+    
+    try:
+        conn = mysql.connector.connect(
+            user='root', 
+            password='123456', 
+            host='127.0.0.1', 
+            database='quran_api',
+            charset='utf8mb4',
+            collation='utf8mb4_unicode_ci'
+        )
+        cur = conn.cursor()
+        print("✅ Database connection established")
+        return True
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        return False
 
 def get_request_headers():
     """Get randomized headers to avoid blocking"""
@@ -234,8 +273,16 @@ def get_request_headers():
         'Upgrade-Insecure-Requests': '1',
     }
 
-def download_with_retry(url, max_retries=RETRY_ATTEMPTS):
-    """Download with retry logic and multiple CDN sources"""
+def download_with_retry(url, max_retries=RETRY_ATTEMPTS, record=True):
+    """Download with retry logic and multiple CDN sources
+    
+    record=False keeps a build-mode download out of the snapshot, for
+    responses the caller stores under their own key.
+    """
+    
+    # Replay mode never touches the network
+    if SNAPSHOT_MODE == "replay":
+        return snapshot.response(url)
     
     for attempt in range(max_retries):
         try:
@@ -243,6 +290,8 @@ def download_with_retry(url, max_retries=RETRY_ATTEMPTS):
             response = requests.get(url, headers=headers, timeout=30)
             
             if response.status_code == 200:
+                if SNAPSHOT_MODE == "build" and record:
+                    snapshot.record(url, response.content)
                 return response
             elif response.status_code == 403:
                 if SHOW_PROGRESS:
@@ -274,6 +323,10 @@ def print_configuration():
     print(f"🤖 Auto Confirm: {AUTO_CONFIRM}")
     print(f"🔄 Retry Attempts: {RETRY_ATTEMPTS}")
     print(f"🌐 CDN Fallback: {USE_CDN_FALLBACK}")
+    print(f"📦 Snapshot Mode: {SNAPSHOT_MODE or 'off'}" + (f" ({snapshotFile})" if SNAPSHOT_MODE else ""))
+    print(f"🧼 Normalize Text: {NORMALIZE_TEXT}")
+    print(f"🧠 Profile Memory: {PROFILE_MEMORY}")
+    print(f"📦 Write Batch Size: {WRITE_BATCH_SIZE}")
     print("=" * 60)
 
 def fetch_cdn_tafsir_data():
@@ -285,6 +338,15 @@ def fetch_cdn_tafsir_data():
     # Try to get data for primary tafsir ID
     tafsir_ids_to_try = [primaryTafsirId] + fallbackTafsirIds
     
+    if SNAPSHOT_MODE == "replay":
+        for tafsir_id in tafsir_ids_to_try:
+            data = snapshot.read_json(cdn_key(tafsir_id))
+            if data is not None:
+                tafsir_data[tafsir_id] = data
+                if SHOW_PROGRESS:
+                    print(f"   ✅ Loaded from snapshot: tafsir ID {tafsir_id} ({len(data)} entries)")
+        return tafsir_data
+    
     for tafsir_id in tafsir_ids_to_try:
         filename = f"cdn_tafsir_{tafsir_id}.json"
         
@@ -298,6 +360,8 @@ def fetch_cdn_tafsir_data():
                     tafsir_data[tafsir_id] = data
                     if SHOW_PROGRESS:
                         print(f"      📊 Loaded {len(data)} entries")
+                if SNAPSHOT_MODE == "build":
+                    snapshot.record_json(cdn_key(tafsir_id), data)
                 continue
             except Exception as e:
                 print(f"      ❌ Error loading {filename}: {e}")
@@ -315,7 +379,8 @@ def fetch_cdn_tafsir_data():
                 if SHOW_PROGRESS:
                     print(f"      🔗 Trying: {cdn_base}")
                 
-                response = download_with_retry(tafsir_url)
+                # Stored once under cdn_key() below, which is what replay reads
+                response = download_with_retry(tafsir_url, record=False)
                 
                 if response and response.status_code == 200:
                     try:
@@ -326,6 +391,8 @@ def fetch_cdn_tafsir_data():
                             json.dump(data, f, ensure_ascii=False, indent=2)
                         
                         tafsir_data[tafsir_id] = data
+                        if SNAPSHOT_MODE == "build":
+                            snapshot.record_json(cdn_key(tafsir_id), data)
                         if SHOW_PROGRESS:
                             print(f"      ✅ Downloaded: {len(data)} entries")
                         downloaded = True
@@ -425,7 +492,8 @@ def get_qurancom_api_data(verse_key, chapter_no, verse_no):
                 if SHOW_PROGRESS:
                     print(f"      ❌ API error for ID {tafsir_id}: Status {response.status_code if response else 'No response'}")
             
-            time.sleep(0.3)  # Rate limiting
+            if SNAPSHOT_MODE != "replay":
+                time.sleep(0.3)  # Rate limiting
             
         except Exception as e:
             if SHOW_PROGRESS:
@@ -434,8 +502,92 @@ def get_qurancom_api_data(verse_key, chapter_no, verse_no):
     
     return translation_text, footnotes_text, tafsir_text
 
+def fetch_chapter_verses(chapter_no):
+    """Download one chapter page with translations, or None on failure"""
+    url = f"{versesUrl}/{chapter_no}"
+    params = {
+        "translations": translationId,
+        "per_page": 300,
+        "fields": "text_uthmani"
+    }
+    
+    response = download_with_retry(url + "?" + "&".join([f"{k}={v}" for k, v in params.items()]))
+    
+    if response and response.status_code == 200:
+        return response.json().get("verses", [])
+    return None
+
+def assemble_verse(verse, chapter_no, cdn_data):
+    """Collect translation, footnotes and tafsir for one verse of a chapter page"""
+    verse_number = verse.get("verse_number")
+    verse_key = verse.get("verse_key")
+    
+    # Get translation from API response
+    translation_text = ""
+    footnotes_text = ""
+    translations = verse.get("translations", [])
+    
+    if translations:
+        translation_text = translations[0].get("text", "")
+        footnotes = translations[0].get("footnotes", [])
+        if footnotes:
+            footnotes_text = " | ".join([fn.get("text", "") for fn in footnotes])
+    
+    # Get tafsir from CDN first
+    tafsir_source = None
+    tafsir_text = get_tafsir_from_cdn(cdn_data, chapter_no, verse_number)
+    
+    if tafsir_text:
+        tafsir_source = "cdn"
+    else:
+        # Fallback to API tafsir
+        _, _, api_tafsir = get_qurancom_api_data(verse_key, chapter_no, verse_number)
+        if api_tafsir:
+            tafsir_text = api_tafsir
+            tafsir_source = "api"
+        else:
+            tafsir_text = "📚 TAFSIR: [No commentary available for this verse]"
+    
+    return {
+        "verse_number": verse_number,
+        "verse_key": verse_key,
+        "translation": translation_text,
+        "footnotes": footnotes_text,
+        "tafsir": tafsir_text,
+        "has_translation": bool(translations),
+        "tafsir_source": tafsir_source,
+    }
+
+def build_row_values(translation_id, chapter_no, row):
+    """Build INSERT values, combining footnotes and tafsir into the footnote column"""
+    footnotes_text = row["footnotes"]
+    tafsir_text = row["tafsir"]
+    
+    # Normalized rows carry clean text, so restore the banners here
+    if "footnote_list" in row:
+        footnotes_text = " | ".join(row["footnote_list"])
+        if tafsir_text and row.get("tafsir_id"):
+            tafsir_text = f"📚 TAFSIR (ID-{row['tafsir_id']}):\n{tafsir_text}"
+        elif tafsir_text:
+            tafsir_text = f"📚 TAFSIR:\n{tafsir_text}"
+        else:
+            tafsir_text = "📚 TAFSIR: [No commentary available for this verse]"
+    
+    # Combine footnotes and tafsir
+    combined_footnote = ""
+    if footnotes_text and tafsir_text:
+        combined_footnote = f"📝 FOOTNOTES:\n{footnotes_text}\n\n{tafsir_text}"
+    elif footnotes_text:
+        combined_footnote = f"📝 FOOTNOTES:\n{footnotes_text}"
+    elif tafsir_text:
+        combined_footnote = tafsir_text
+    
+    return (translation_id, translationCode, chapter_no, row["verse_number"],
+            row["translation"], combined_footnote)
+
 def import_complete_edition():
     """Import complete edition with translations and tafsir"""
+    global import_checksums
     
     print_configuration()
     
@@ -457,7 +609,8 @@ def import_complete_edition():
     print(f"✅ Using translation ID: {translation_id}")
     
     # Fetch CDN tafsir data
-    cdn_data = fetch_cdn_tafsir_data()
+    with memory_profiler.phase("fetch_cdn_tafsir_data"):
+        cdn_data = fetch_cdn_tafsir_data()
     
     # Clean existing data
     print(f"\n🧹 Cleaning existing data for {translationCode}...")
@@ -467,133 +620,163 @@ def import_complete_edition():
     # Import all chapters
     print(f"\n📖 Importing all 114 chapters for {translationName}...")
     
-    # Statistics
-    total_verses = 0
-    translation_success = 0
-    cdn_tafsir_success = 0
-    api_tafsir_success = 0
+    # Statistics (only updated by the writer stage)
+    stats = {
+        "translation_success": 0,
+        "cdn_tafsir_success": 0,
+        "api_tafsir_success": 0,
+    }
     
     start_time = time.time()
     
-    # Process all 114 chapters
-    for chapter_no in range(1, 115):
-        chapter_start_time = time.time()
-        if SHOW_PROGRESS:
-            print(f"\n📚 Chapter {chapter_no:3d}/114", end="")
-        
+    # Text normalization runs in worker processes over whole chapters
+    normalizer = NormalizationStage() if NORMALIZE_TEXT else None
+    search_index = open(searchIndexFile, 'w', encoding='utf-8') if normalizer else None
+    
+    def fetch_chapters():
+        """Fetch stage: download chapter pages ahead of the other stages"""
+        for chapter_no in range(1, 115):
+            chapter = {"chapter_no": chapter_no, "start_time": time.time(), "verses": None, "error": None}
+            try:
+                chapter["verses"] = fetch_chapter_verses(chapter_no)
+                if chapter["verses"] is None:
+                    chapter["error"] = "API Error: No response or bad status"
+            except Exception as e:
+                chapter["error"] = f"Chapter Error: {str(e)[:50]}"
+            yield chapter
+    
+    def assemble_chapter(chapter):
+        """Assemble stage: attach tafsir (CDN first, API fallback) to every verse"""
+        if chapter["verses"] is None:
+            return chapter
         try:
-            # Get chapter info from API
-            url = f"{versesUrl}/{chapter_no}"
-            params = {
-                "translations": translationId,
-                "per_page": 300,
-                "fields": "text_uthmani"
-            }
+            chapter["rows"] = [assemble_verse(verse, chapter["chapter_no"], cdn_data)
+                               for verse in chapter["verses"]]
+        except Exception as e:
+            chapter["error"] = f"Chapter Error: {str(e)[:50]}"
+        return chapter
+    
+    def normalize_chapter(chapter):
+        """Normalize stage: queue the chapter in the process pool without waiting
+        
+        The writer resolves the future, so several chapters normalize in parallel
+        while earlier ones are written.
+        """
+        if chapter.get("rows"):
+            chapter["normalized"] = normalizer.submit(chapter["chapter_no"], chapter["rows"])
+        return chapter
+    
+    # Expected per-chapter checksums for post-import verification
+    import_checksums = ChapterChecksums()
+    
+    def report_insert_error(values, error):
+        import_checksums.remove(*values[2:])
+        print(f"\n      ❌ Failed to insert {values[2]}:{values[3]}: {error}")
+    
+    writer = BatchWriter(
+        conn,
+        '''INSERT INTO quran_translations 
+           (translation_id, translation_code, chapter_no, verse_no, translation, footnote)
+           VALUES (%s, %s, %s, %s, %s, %s)''',
+        batch_size=WRITE_BATCH_SIZE,
+        on_row_error=report_insert_error
+    )
+    
+    def write_chapter(chapter):
+        """Write stage: owns the connection, queues rows and commits in batches"""
+        chapter_no = chapter["chapter_no"]
+        
+        if chapter["error"]:
+            if SHOW_PROGRESS:
+                print(f"📚 Chapter {chapter_no:3d}/114 ❌ {chapter['error']}")
+        else:
+            if "normalized" in chapter:
+                _, chapter["rows"] = chapter.pop("normalized").result()
+            rows = chapter["rows"]
+            chapter_verses = len(rows)
+            chapter_tafsir = 0
             
-            response = download_with_retry(url + "?" + "&".join([f"{k}={v}" for k, v in params.items()]))
+            for row in rows:
+                if row["has_translation"]:
+                    stats["translation_success"] += 1
+                if row["tafsir_source"] == "cdn":
+                    stats["cdn_tafsir_success"] += 1
+                    chapter_tafsir += 1
+                elif row["tafsir_source"] == "api":
+                    stats["api_tafsir_success"] += 1
+                    chapter_tafsir += 1
             
-            if response and response.status_code == 200:
-                data = response.json()
-                verses = data.get("verses", [])
-                chapter_verses = len(verses)
-                chapter_cdn_tafsir = 0
-                chapter_api_tafsir = 0
-                
-                if SHOW_PROGRESS:
-                    print(f" ({chapter_verses:3d} verses)", end="")
-                
-                for verse in verses:
-                    verse_number = verse.get("verse_number")
-                    verse_key = verse.get("verse_key")
-                    
-                    # Get translation from API response
-                    translation_text = ""
-                    footnotes_text = ""
-                    translations = verse.get("translations", [])
-                    
-                    if translations:
-                        translation_text = translations[0].get("text", "")
-                        footnotes = translations[0].get("footnotes", [])
-                        if footnotes:
-                            footnotes_text = " | ".join([fn.get("text", "") for fn in footnotes])
-                        translation_success += 1
-                    
-                    # Get tafsir from CDN first
-                    tafsir_text = get_tafsir_from_cdn(cdn_data, chapter_no, verse_number)
-                    
-                    if tafsir_text:
-                        cdn_tafsir_success += 1
-                        chapter_cdn_tafsir += 1
-                    else:
-                        # Fallback to API tafsir
-                        _, _, api_tafsir = get_qurancom_api_data(verse_key, chapter_no, verse_number)
-                        if api_tafsir:
-                            tafsir_text = api_tafsir
-                            api_tafsir_success += 1
-                            chapter_api_tafsir += 1
-                        else:
-                            tafsir_text = "📚 TAFSIR: [No commentary available for this verse]"
-                    
-                    # Combine footnotes and tafsir
-                    combined_footnote = ""
-                    if footnotes_text and tafsir_text:
-                        combined_footnote = f"📝 FOOTNOTES:\n{footnotes_text}\n\n{tafsir_text}"
-                    elif footnotes_text:
-                        combined_footnote = f"📝 FOOTNOTES:\n{footnotes_text}"
-                    elif tafsir_text:
-                        combined_footnote = tafsir_text
-                    
-                    # Insert into database
-                    try:
-                        cur.execute(
-                            '''INSERT INTO quran_translations 
-                               (translation_id, translation_code, chapter_no, verse_no, translation, footnote)
-                               VALUES (%s, %s, %s, %s, %s, %s)''',
-                            (translation_id, translationCode, chapter_no, verse_number, 
-                             translation_text, combined_footnote)
-                        )
-                        total_verses += 1
-                        
-                    except Exception as e:
-                        print(f"\n      ❌ Failed to insert {chapter_no}:{verse_number}: {e}")
-                
-                # Chapter completion info
-                chapter_time = time.time() - chapter_start_time
-                tafsir_coverage = ((chapter_cdn_tafsir + chapter_api_tafsir) / chapter_verses * 100) if chapter_verses > 0 else 0
-                
-                if SHOW_PROGRESS:
-                    print(f" ✅ {tafsir_coverage:5.1f}% tafsir ({chapter_time:.1f}s)")
-                
-                # Commit after each chapter
-                conn.commit()
-                
-            else:
-                if SHOW_PROGRESS:
-                    print(f" ❌ API Error: No response or bad status")
-                
-        except Exception as e:
-            print(f" ❌ Chapter Error: {str(e)[:50]}")
+            values = [build_row_values(translation_id, chapter_no, row) for row in rows]
+            for row_values in values:
+                import_checksums.add(*row_values[2:])
+            writer.add(values)
+            
+            if search_index:
+                for row in rows:
+                    search_index.write(json.dumps({
+                        "verse_key": row["verse_key"],
+                        "translation_search": row["translation_search"],
+                        "tafsir_search": row["tafsir_search"],
+                        "footnote_markers": row["footnote_markers"],
+                    }, ensure_ascii=False) + "\n")
+            
+            # Chapter completion info
+            chapter_time = time.time() - chapter["start_time"]
+            tafsir_coverage = (chapter_tafsir / chapter_verses * 100) if chapter_verses > 0 else 0
+            
+            if SHOW_PROGRESS:
+                print(f"📚 Chapter {chapter_no:3d}/114 ({chapter_verses:3d} verses) ✅ {tafsir_coverage:5.1f}% tafsir ({chapter_time:.1f}s)")
         
         # Progress update every 20 chapters (only if showing progress)
         if SHOW_PROGRESS and chapter_no % 20 == 0:
             elapsed = time.time() - start_time
-            trans_pct = (translation_success / total_verses * 100) if total_verses > 0 else 0
-            tafsir_pct = ((cdn_tafsir_success + api_tafsir_success) / total_verses * 100) if total_verses > 0 else 0
+            total_verses = writer.rows_written + len(writer.pending)
+            trans_pct = (stats["translation_success"] / total_verses * 100) if total_verses > 0 else 0
+            tafsir_pct = ((stats["cdn_tafsir_success"] + stats["api_tafsir_success"]) / total_verses * 100) if total_verses > 0 else 0
             
             print(f"\n   📊 Progress Update:")
             print(f"      Chapters completed: {chapter_no}/114")
             print(f"      Total verses: {total_verses}")
             print(f"      Translation coverage: {trans_pct:.1f}%")
             print(f"      Tafsir coverage: {tafsir_pct:.1f}%")
-            print(f"      Time elapsed: {elapsed/60:.1f} minutes")
+            print(f"      Rows committed: {writer.rows_written} ({writer.commits} commits)")
+            print(f"      Time elapsed: {elapsed/60:.1f} minutes\n")
         elif not SHOW_PROGRESS and chapter_no % 10 == 0:
             # Minimal progress for non-verbose mode
             elapsed = time.time() - start_time
             print(f"📊 Progress: {chapter_no}/114 chapters ({elapsed/60:.1f}m)")
     
+    stages = [("assemble", assemble_chapter)]
+    if normalizer:
+        stages.append(("normalize", normalize_chapter))
+    
+    # fetch -> assemble (-> normalize) -> write, connected by bounded queues
+    try:
+        with memory_profiler.phase("import_pipeline"):
+            Pipeline(queue_size=PIPELINE_QUEUE_SIZE).run(fetch_chapters, stages, write_chapter, finish=writer.close)
+    except PipelineError as e:
+        print(f"\n❌ Import pipeline stopped in '{e.stage_name}' stage: {e.error}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        print(f"   💾 {writer.rows_written} rows were committed before the failure")
+        return False
+    finally:
+        # Also runs when a stage fails and the pipeline skips writer.close
+        writer.release()
+        if normalizer:
+            normalizer.shutdown()
+        if isinstance(snapshot, SnapshotReader):
+            snapshot.close()
+        if search_index:
+            search_index.close()
+    
     # Final statistics
     total_time = time.time() - start_time
-    total_tafsir = cdn_tafsir_success + api_tafsir_success
+    total_verses = writer.rows_written
+    translation_success = stats["translation_success"]
+    total_tafsir = stats["cdn_tafsir_success"] + stats["api_tafsir_success"]
     
     print(f"\n{'='*80}")
     print(f"🎉 {translationName.upper()} IMPORT COMPLETED!")
@@ -603,9 +786,81 @@ def import_complete_edition():
     print(f"   📖 Total verses imported: {total_verses}")
     print(f"   📝 Translation coverage: {translation_success}/{total_verses} ({translation_success/total_verses*100:.1f}%)")
     print(f"   📚 Tafsir coverage: {total_tafsir}/{total_verses} ({total_tafsir/total_verses*100:.1f}%)")
+    print(f"   💾 Commits: {writer.commits} (batch size {WRITE_BATCH_SIZE})")
+    if search_index:
+        print(f"   🔎 Search forms and footnote markers: '{searchIndexFile}'")
     
     return True
 
+def build_offline_snapshot():
+    """Capture chapter pages, CDN tafsir files and by_ayah fallbacks into one archive"""
+    global snapshot
+    
+    print_configuration()
+    print(f"📦 Building offline snapshot: {snapshotFile}")
+    
+    snapshot = SnapshotWriter(snapshotFile, info={
+        "edition_code": translationCode,
+        "edition_name": translationName,
+        "tafsir_id": primaryTafsirId,
+        "translation_id": translationId,
+        "fallback_tafsir_ids": fallbackTafsirIds,
+    })
+    start_time = time.time()
+    
+    cdn_data = fetch_cdn_tafsir_data()
+    
+    missing_chapters = []
+    api_fallbacks = 0
+    
+    # Same fetch + assemble path as the import, so every URL it needs is recorded
+    for chapter_no in range(1, 115):
+        verses = fetch_chapter_verses(chapter_no)
+        if verses is None:
+            missing_chapters.append(chapter_no)
+            print(f"📚 Chapter {chapter_no:3d}/114 ❌ API Error: No response or bad status")
+            continue
+        
+        for verse in verses:
+            row = assemble_verse(verse, chapter_no, cdn_data)
+            if row["tafsir_source"] == "api":
+                api_fallbacks += 1
+        
+        if SHOW_PROGRESS:
+            print(f"📚 Chapter {chapter_no:3d}/114 ({len(verses):3d} verses) 📥 captured")
+    
+    snapshot.info["missing_chapters"] = missing_chapters
+    index = snapshot.save()
+    
+    total_bytes = sum(entry["bytes"] for entry in index["entries"].values())
+    print(f"\n{'='*80}")
+    print(f"🎉 SNAPSHOT SAVED: {snapshotFile}")
+    print(f"   📄 Entries: {len(index['entries'])} ({api_fallbacks} verses use by_ayah fallbacks)")
+    print(f"   💾 Uncompressed: {total_bytes/1024/1024:.2f} MB, archive: {os.path.getsize(snapshotFile)/1024/1024:.2f} MB")
+    print(f"   ⏱️  Time: {(time.time() - start_time)/60:.1f} minutes")
+    if missing_chapters:
+        print(f"   ⚠️  Missing chapters: {missing_chapters}")
+    
+    return not missing_chapters
+
+def open_offline_snapshot():
+    """Open the snapshot used for replay imports"""
+    global snapshot
+    
+    if not os.path.exists(snapshotFile):
+        print(f"❌ Snapshot not found: {snapshotFile}")
+        return False
+    
+    snapshot = SnapshotReader(snapshotFile)
+    edition_code = snapshot.info.get("edition_code")
+    if edition_code != translationCode:
+        print(f"❌ Snapshot is for '{edition_code}', not '{translationCode}'")
+        snapshot.close()
+        return False
+    
+    print(f"📦 Replaying from snapshot: {snapshotFile} ({len(snapshot.entries)} entries, created {snapshot.index.get('created_at')})")
+    return True
+
 def list_available_editions():
     """List all available editions"""
     if not SHOW_PROGRESS:
@@ -632,6 +887,13 @@ def list_available_editions():
             print()
 
 if __name__ == "__main__":
+    # Set UTF-8 encoding for console output
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    
+    # Database connection (not needed to build a snapshot)
+    if SNAPSHOT_MODE != "build" and not connect_database():
+        sys.exit(1)
+    
     print("🕌 AUTOMATED QURAN TAFSIR IMPORTER (IMPROVED)")
     print("=" * 80)
     print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -659,28 +921,38 @@ if __name__ == "__main__":
             print("⚠️  No input available, using AUTO_CONFIRM=True")
             proceed = True
     
-    if proceed:
+    if proceed and SNAPSHOT_MODE == "build":
+        try:
+            if build_offline_snapshot():
+                print(f"💡 Set SNAPSHOT_MODE = \"replay\" to import from '{snapshotFile}' offline")
+            else:
+                print("⚠️  Snapshot is incomplete, replay will skip the missing chapters")
+        except Exception as e:
+            print(f"❌ Critical error while building snapshot: {e}")
+            import traceback
+            traceback.print_exc()
+    elif proceed:
         try:
-            # Start import
-            success = import_complete_edition()
+            # Start import (from the snapshot in replay mode)
+            if SNAPSHOT_MODE == "replay" and not open_offline_snapshot():
+                success = False
+            else:
+                success = import_complete_edition()
             
             if success:
                 print(f"\n🔍 Final Database Verification:")
                 print("-" * 50)
                 
-                # Final verification
-                cur.execute("SELECT COUNT(*) FROM quran_translations WHERE translation_code = %s", (translationCode,))
-                total_count = cur.fetchone()[0]
+                # Final verification: one indexed aggregate pass with per-chapter checksums
+                if ensure_translation_code_index(conn):
+                    print("🗂️  Created index on quran_translations (translation_code, chapter_no)")
+                with memory_profiler.phase("verification"):
+                    verification = verify_import(conn, translationCode, import_checksums)
                 
-                cur.execute("SELECT COUNT(*) FROM quran_translations WHERE translation_code = %s AND translation IS NOT NULL AND translation != ''", (translationCode,))
-                translation_count = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM quran_translations WHERE translation_code = %s AND footnote IS NOT NULL AND footnote != ''", (translationCode,))
-                footnote_count = cur.fetchone()[0]
-                
-                # Chapter count verification
-                cur.execute("SELECT COUNT(DISTINCT chapter_no) FROM quran_translations WHERE translation_code = %s", (translationCode,))
-                chapter_count = cur.fetchone()[0]
+                total_count = verification["total_verses"]
+                translation_count = verification["translation_count"]
+                footnote_count = verification["footnote_count"]
+                chapter_count = verification["total_chapters"]
                 
                 print(f"✅ Database contains:")
                 print(f"   📖 Chapters: {chapter_count}/114")
@@ -688,6 +960,12 @@ if __name__ == "__main__":
                 print(f"   🔤 With translation: {translation_count} ({translation_count/total_count*100:.1f}%)")
                 print(f"   📚 With tafsir: {footnote_count} ({footnote_count/total_count*100:.1f}%)")
                 
+                if verification["verified"]:
+                    print(f"   🔐 Checksums: all {chapter_count} chapters match")
+                else:
+                    mismatched = [item["chapter"] for item in verification["mismatched_chapters"]]
+                    print(f"   ❌ Checksums: {len(mismatched)} chapters differ from the import: {mismatched}")
+                
                 # Create success report
                 completion_report = {
                     "import_completed": True,
@@ -699,13 +977,24 @@ if __name__ == "__main__":
                     "auto_confirmed": AUTO_CONFIRM,
                     "cdn_fallback_used": USE_CDN_FALLBACK,
                     "retry_attempts": RETRY_ATTEMPTS,
+                    "snapshot_mode": SNAPSHOT_MODE,
+                    "snapshot_file": snapshotFile if SNAPSHOT_MODE else None,
+                    "search_index_file": searchIndexFile if NORMALIZE_TEXT else None,
                     "statistics": {
                         "total_chapters": chapter_count,
                         "total_verses": total_count,
                         "translation_coverage": f"{translation_count/total_count*100:.1f}%",
                         "tafsir_coverage": f"{footnote_count/total_count*100:.1f}%"
+                    },
+                    "verification": {
+                        "verified": verification["verified"],
+                        "mismatched_chapters": verification["mismatched_chapters"],
+                        "chapter_checksums": import_checksums.to_dict()
                     }
                 }
+                if PROFILE_MEMORY:
+                    memory_profiler.print_summary()
+                    completion_report["memory_profile"] = memory_profiler.report()
                 
                 report_filename = f'{translationCode}_import_report.json'
                 with open(report_filename, 'w', encoding='utf-8') as f:
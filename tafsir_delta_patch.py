@@ -0,0 +1,314 @@
+import sys
+import json
+import hashlib
+import os
+from datetime import datetime
+
+from build_tafsir_bundles import encode_json, load_edition
+from tafsir_text_normalizer import split_combined_footnote, verse_to_row
+
+# ============================================================================
+# PATCH SETTINGS
+# ============================================================================
+PATCH_FORMAT_VERSION = 2  # 2 adds removed_fields
+VERSE_FIELDS = ("tf", "tr")  # Per-verse fields tracked by patches
+SHOW_PROGRESS = True
+
+# Database settings used when applying a patch to quran_translations
+DB_CONFIG = {
+    "user": 'root',
+    "password": '123456',
+    "host": '127.0.0.1',
+    "database": 'quran_api',
+    "charset": 'utf8mb4',
+    "collation": 'utf8mb4_unicode_ci',
+}
+
+
+def edition_content_hash(edition):
+    """Hash the verse content of an edition independently of file formatting"""
+    return hashlib.sha256(encode_json(edition.get("vs", {}))).hexdigest()
+
+
+def edition_version_info(edition):
+    """Version fields recorded on both sides of a patch"""
+    meta = edition.get("meta", {})
+    return {
+        "tid": meta.get("tid"),
+        "v": meta.get("v"),
+        "date": meta.get("date"),
+        "verses": len(edition.get("vs", {})),
+        "sha256": edition_content_hash(edition),
+    }
+
+
+def diff_editions(old_edition, new_edition):
+    """Compute a verse-level patch between two versions of an edition"""
+    old_verses = old_edition.get("vs", {})
+    new_verses = new_edition.get("vs", {})
+
+    added = {}
+    changed = {}
+    removed_fields = {}
+    removed = []
+
+    for verse_key, new_verse in new_verses.items():
+        old_verse = old_verses.get(verse_key)
+        if old_verse is None:
+            added[verse_key] = new_verse
+            continue
+        fields = {field: new_verse[field] for field in VERSE_FIELDS
+                  if field in new_verse and old_verse.get(field) != new_verse[field]}
+        if fields:
+            changed[verse_key] = fields
+        # A field dropped from the new version is listed, not stored as null
+        dropped = [field for field in VERSE_FIELDS if field in old_verse and field not in new_verse]
+        if dropped:
+            removed_fields[verse_key] = dropped
+
+    for verse_key in old_verses:
+        if verse_key not in new_verses:
+            removed.append(verse_key)
+
+    patch = {
+        "format": PATCH_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "from": edition_version_info(old_edition),
+        "to": edition_version_info(new_edition),
+        "meta": new_edition.get("meta", {}),
+        "added": added,
+        "changed": changed,
+        "removed_fields": removed_fields,
+        "removed": removed,
+    }
+    if old_edition.get("chs") != new_edition.get("chs"):
+        patch["chs"] = new_edition.get("chs", {})
+
+    return patch
+
+
+def patch_summary(patch):
+    """Short counts for console output and reports"""
+    return {
+        "added": len(patch.get("added", {})),
+        "changed": len(set(patch.get("changed", {})) | set(patch.get("removed_fields", {}))),
+        "removed": len(patch.get("removed", [])),
+    }
+
+
+def apply_patch_to_edition(edition, patch, verify=True):
+    """Apply a patch to a loaded edition in place"""
+    if verify:
+        current_hash = edition_content_hash(edition)
+        if current_hash == patch["to"]["sha256"]:
+            if SHOW_PROGRESS:
+                print("   ⏭️  Edition already at target version")
+            return edition
+        if current_hash != patch["from"]["sha256"]:
+            raise ValueError(
+                f"Patch base mismatch: edition hash {current_hash[:12]} "
+                f"!= patch base {patch['from']['sha256'][:12]}"
+            )
+
+    verses = edition.setdefault("vs", {})
+    for verse_key in patch.get("removed", []):
+        verses.pop(verse_key, None)
+    for verse_key, fields in patch.get("changed", {}).items():
+        verses[verse_key].update(fields)
+    for verse_key, fields in patch.get("removed_fields", {}).items():
+        for field in fields:
+            verses[verse_key].pop(field, None)
+    for verse_key, verse in patch.get("added", {}).items():
+        verses[verse_key] = verse
+
+    # Keep verses in canonical chapter:verse order after additions
+    if patch.get("added"):
+        edition["vs"] = dict(sorted(verses.items(), key=lambda item: (item[1]["c"], item[1]["n"])))
+
+    edition["meta"] = patch.get("meta", edition.get("meta", {}))
+    if "chs" in patch:
+        edition["chs"] = patch["chs"]
+
+    if verify and edition_content_hash(edition) != patch["to"]["sha256"]:
+        raise ValueError("Patched edition does not match the target hash")
+
+    return edition
+
+
+def apply_patch_to_file(patch, path):
+    """Apply a patch to an edition JSON file and rewrite it atomically"""
+    edition = load_edition(path)
+    if edition_content_hash(edition) == patch["to"]["sha256"]:
+        if SHOW_PROGRESS:
+            print(f"   ⏭️  {path} already at target version")
+        return edition
+    apply_patch_to_edition(edition, patch)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(edition, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+    if SHOW_PROGRESS:
+        summary = patch_summary(patch)
+        print(f"   ✅ Patched {path}: +{summary['added']} ~{summary['changed']} -{summary['removed']}")
+    return edition
+
+
+def get_database_connection():
+    """Open a MySQL connection using the importer's settings"""
+    import mysql.connector
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def apply_patch_to_database(patch, translation_code, conn=None):
+    """Apply a patch to quran_translations rows of one translation_code in a single transaction
+
+    Unlike apply_patch_to_edition, the stored rows are not checked against
+    the patch's "from" version: the caller must make sure the rows were
+    imported from that version, or changed verses are overwritten regardless.
+    """
+    own_connection = conn is None
+    if own_connection:
+        conn = get_database_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute("SELECT id FROM translations WHERE code = %s", (translation_code,))
+        translation = cur.fetchone()
+        if not translation:
+            raise ValueError(f"Translation '{translation_code}' not found")
+        translation_id = translation[0]
+        tafsir_id = patch.get("meta", {}).get("tid")
+
+        removed_rows = []
+        for verse_key in patch.get("removed", []):
+            chapter_no, verse_no = verse_key.split(":")
+            removed_rows.append((translation_code, int(chapter_no), int(verse_no)))
+        if removed_rows:
+            cur.executemany(
+                "DELETE FROM quran_translations WHERE translation_code = %s AND chapter_no = %s AND verse_no = %s",
+                removed_rows
+            )
+
+        # Changed entries only carry the fields that differ, so add the verse position
+        upsert_verses = dict(patch.get("added", {}))
+        for verse_key, fields in patch.get("changed", {}).items():
+            chapter_no, verse_no = verse_key.split(":")
+            upsert_verses[verse_key] = dict(fields, c=int(chapter_no), n=int(verse_no))
+        for verse_key, fields in patch.get("removed_fields", {}).items():
+            chapter_no, verse_no = verse_key.split(":")
+            verse = upsert_verses.setdefault(verse_key, {"c": int(chapter_no), "n": int(verse_no)})
+            # A dropped field empties its column
+            verse.update((field, None) for field in fields)
+
+        # rowcount is 0 for no-op UPDATEs, so look up existing rows up front,
+        # along with the stored footnotes that a tafsir update has to keep.
+        # Only the patched verses are read, one query per affected chapter.
+        patched_verses = {}
+        for verse in upsert_verses.values():
+            patched_verses.setdefault(int(verse["c"]), []).append(int(verse["n"]))
+        existing = {}
+        for chapter_no, verse_numbers in sorted(patched_verses.items()):
+            placeholders = ", ".join(["%s"] * len(verse_numbers))
+            cur.execute(
+                f'''SELECT verse_no, footnote FROM quran_translations
+                    WHERE translation_code = %s AND chapter_no = %s AND verse_no IN ({placeholders})''',
+                (translation_code, chapter_no, *verse_numbers)
+            )
+            for verse_no, footnote in cur.fetchall():
+                existing[(chapter_no, int(verse_no))] = split_combined_footnote(footnote or "")[0]
+
+        updated = 0
+        inserted = 0
+        for verse_key, verse in upsert_verses.items():
+            chapter_no = int(verse["c"])
+            verse_no = int(verse["n"])
+            translation_text, footnote = verse_to_row(verse, tafsir_id, existing.get((chapter_no, verse_no), ""))
+
+            if (chapter_no, verse_no) not in existing:
+                cur.execute(
+                    '''INSERT INTO quran_translations
+                       (translation_id, translation_code, chapter_no, verse_no, translation, footnote)
+                       VALUES (%s, %s, %s, %s, %s, %s)''',
+                    (translation_id, translation_code, chapter_no, verse_no, translation_text, footnote)
+                )
+                inserted += 1
+                continue
+
+            if "tr" in verse and "tf" in verse:
+                cur.execute(
+                    '''UPDATE quran_translations SET translation = %s, footnote = %s
+                       WHERE translation_code = %s AND chapter_no = %s AND verse_no = %s''',
+                    (translation_text, footnote, translation_code, chapter_no, verse_no)
+                )
+            elif "tr" in verse:
+                cur.execute(
+                    '''UPDATE quran_translations SET translation = %s
+                       WHERE translation_code = %s AND chapter_no = %s AND verse_no = %s''',
+                    (translation_text, translation_code, chapter_no, verse_no)
+                )
+            else:
+                cur.execute(
+                    '''UPDATE quran_translations SET footnote = %s
+                       WHERE translation_code = %s AND chapter_no = %s AND verse_no = %s''',
+                    (footnote, translation_code, chapter_no, verse_no)
+                )
+            updated += 1
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        if own_connection:
+            conn.close()
+
+    if SHOW_PROGRESS:
+        print(f"   ✅ {translation_code}: {updated} updated, {inserted} inserted, {len(removed_rows)} removed")
+
+    return {"updated": updated, "inserted": inserted, "removed": len(removed_rows)}
+
+
+def load_patch(path):
+    """Load a patch file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_patch(patch, path):
+    """Save a patch file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(patch, f, ensure_ascii=False, indent=2)
+
+
+def print_usage():
+    """Print command line usage"""
+    print("Usage:")
+    print("   python tafsir_delta_patch.py diff OLD.json NEW.json PATCH.json")
+    print("   python tafsir_delta_patch.py apply PATCH.json EDITION.json")
+    print("   python tafsir_delta_patch.py apply-db PATCH.json TRANSLATION_CODE")
+    print("      (apply-db does not check the patch's base version; the rows must come from it)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 and not (len(sys.argv) == 4 and sys.argv[1] in ("apply", "apply-db")):
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "diff":
+        old_path, new_path, patch_path = sys.argv[2:5]
+        patch = diff_editions(load_edition(old_path), load_edition(new_path))
+        save_patch(patch, patch_path)
+        summary = patch_summary(patch)
+        print(f"📝 Patch saved: '{patch_path}' "
+              f"(+{summary['added']} ~{summary['changed']} -{summary['removed']} verses)")
+    elif command == "apply":
+        apply_patch_to_file(load_patch(sys.argv[2]), sys.argv[3])
+    elif command == "apply-db":
+        apply_patch_to_database(load_patch(sys.argv[2]), sys.argv[3])
+    else:
+        print_usage()
+        sys.exit(1)
@@ -0,0 +1,260 @@
+import sys
+import re
+import html
+import json
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+# ============================================================================
+# NORMALIZER SETTINGS
+# ============================================================================
+NORMALIZER_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Worker processes for whole chapters
+SHOW_PROGRESS = True
+
+# Precompiled patterns, built once per worker process
+FOOTNOTE_SUP_RE = re.compile(r'<sup[^>]*?foot_note=["\']?(\d+)["\']?[^>]*>\s*(\d+)\s*</sup>', re.IGNORECASE)
+SUP_RE = re.compile(r'<sup[^>]*>\s*(\d+)\s*</sup>', re.IGNORECASE)
+BLOCK_TAG_RE = re.compile(r'<\s*(?:br\s*/?|/p|/div|/h[1-6]|/li|/tr|/blockquote)\s*>', re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r'<\s*li[^>]*>', re.IGNORECASE)
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+# Trailing digits after a word or punctuation, e.g. "Allāh,1" or "We2"; only
+# numbered runs 1, 2, ... up to the verse's footnote count are taken as markers
+INLINE_MARKER_RE = re.compile(r'(?<=[^\W\d_])(\d{1,2})(?=[\s,.;:!?)\]’"\'\-—]|$)|(?<=[.,;!?])(\d{1,2})(?=\s|$)')
+BANNER_RE = re.compile(r'^\s*(?:📚 TAFSIR(?: \(ID-(\d+)\))?:|📝 FOOTNOTES:)\s*', re.MULTILINE)
+TAFSIR_BANNER_RE = re.compile(r'📚 TAFSIR(?: \(ID-(\d+)\))?:\s*')
+FOOTNOTES_BANNER = "📝 FOOTNOTES:"
+NO_COMMENTARY = "[No commentary available for this verse]"
+SPACES_RE = re.compile('[ \t\u00a0\u200b]+')
+SPACE_NEWLINE_RE = re.compile(r' *\n *')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+TATWEEL_RE = re.compile('ـ')
+SEARCH_PUNCT_RE = re.compile(r'[^\w\s]+')
+SEARCH_SPACES_RE = re.compile(r'\s+')
+ARABIC_FOLDING = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ة': 'ه', 'ؤ': 'و', 'ئ': 'ي',
+})
+
+
+def collapse_whitespace(text):
+    """Collapse runs of spaces and blank lines"""
+    text = SPACES_RE.sub(' ', text)
+    text = SPACE_NEWLINE_RE.sub('\n', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()
+
+
+def strip_markup(text):
+    """Convert HTML to plain text, returning (text, footnote markers)"""
+    markers = []
+
+    def replace_footnote(match):
+        markers.append({"marker": int(match.group(2)), "footnote_id": int(match.group(1))})
+        return ''
+
+    def replace_sup(match):
+        markers.append({"marker": int(match.group(1)), "footnote_id": None})
+        return ''
+
+    text = SCRIPT_STYLE_RE.sub('', text)
+    text = FOOTNOTE_SUP_RE.sub(replace_footnote, text)
+    text = SUP_RE.sub(replace_sup, text)
+    text = BLOCK_TAG_RE.sub('\n', text)
+    text = LIST_ITEM_RE.sub('\n- ', text)
+    text = TAG_RE.sub('', text)
+    return html.unescape(text), markers
+
+
+def extract_inline_markers(text, footnote_count):
+    """Remove plain-text footnote markers such as "Allāh,1", returning (text, markers)
+
+    Markers must count up from 1, stay within footnote_count and not follow
+    an all-capitals word, so numbers that belong to the text ("A1", "B52",
+    "COVID19") are left alone.
+    """
+    markers = []
+
+    def replace_marker(match):
+        number = int(match.group(1) or match.group(2))
+        if number != len(markers) + 1 or number > footnote_count:
+            return match.group(0)
+        preceding = match.string[max(0, match.start() - 40):match.start()].split()
+        # Codes such as "A1" or "COVID19" are all capitals before the digits
+        if match.group(1) and preceding and preceding[-1].isupper():
+            return match.group(0)
+        markers.append({"marker": number, "footnote_id": None,
+                        "anchor": preceding[-1] if preceding else ""})
+        return ''
+
+    return INLINE_MARKER_RE.sub(replace_marker, text), markers
+
+
+def search_form(text):
+    """Lowercased, diacritic-free, punctuation-free form for searching"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = TATWEEL_RE.sub('', text).translate(ARABIC_FOLDING).casefold()
+    text = SEARCH_PUNCT_RE.sub(' ', text)
+    return SEARCH_SPACES_RE.sub(' ', text).strip()
+
+
+def split_combined_footnote(text):
+    """Split an importer footnote column into (footnotes, tafsir id, tafsir text)"""
+    footnotes = ""
+    tafsir_id = None
+    tafsir_text = ""
+    if not text:
+        return footnotes, tafsir_id, tafsir_text
+
+    match = TAFSIR_BANNER_RE.search(text)
+    head = text[:match.start()] if match else text
+    if match:
+        tafsir_id = int(match.group(1)) if match.group(1) else None
+        tafsir_text = text[match.end():].strip()
+        if tafsir_text == NO_COMMENTARY:
+            tafsir_text = ""
+
+    if head.strip().startswith(FOOTNOTES_BANNER):
+        footnotes = head.strip()[len(FOOTNOTES_BANNER):].strip()
+
+    return footnotes, tafsir_id, tafsir_text
+
+
+def verse_to_row(verse, tafsir_id, footnotes=""):
+    """Convert an edition verse into (translation, footnote) columns as the importer stores them
+
+    footnotes is the translation footnote text kept ahead of the tafsir part.
+    """
+    translations = verse.get("tr") or []
+    translation_text = translations[0].get("t", "") if translations else ""
+
+    tafsir = verse.get("tf") or {}
+    tafsir_text = (tafsir.get("t") or "").strip()
+    if tafsir_text:
+        footnote = f"📚 TAFSIR (ID-{tafsir.get('id', tafsir_id)}):\n{tafsir_text}"
+    else:
+        footnote = f"📚 TAFSIR: {NO_COMMENTARY}"
+    if footnotes:
+        footnote = f"{FOOTNOTES_BANNER}\n{footnotes}\n\n{footnote}"
+
+    return translation_text, footnote
+
+
+def normalize_text(text, footnote_count=0):
+    """Normalize one text field into clean text, search text and footnote markers
+
+    Plain-text markers are only extracted when footnote_count is given.
+    """
+    if not text:
+        return {"text": "", "search": "", "markers": []}
+
+    text = BANNER_RE.sub('', text)
+    text, markers = strip_markup(text)
+    if footnote_count and not markers:
+        text, markers = extract_inline_markers(text, footnote_count)
+    text = collapse_whitespace(text)
+
+    return {"text": text, "search": search_form(text), "markers": markers}
+
+
+def normalize_verse(verse):
+    """Normalize one assembled verse dict (translation, footnotes, tafsir)"""
+    footnotes = [collapse_whitespace(strip_markup(part)[0])
+                 for part in (verse.get("footnotes") or "").split(" | ") if part.strip()]
+    translation = normalize_text(verse.get("translation", ""), footnote_count=len(footnotes))
+    banner = TAFSIR_BANNER_RE.search(verse.get("tafsir") or "")
+    tafsir = normalize_text(verse.get("tafsir", ""))
+    if tafsir["text"] == NO_COMMENTARY:
+        tafsir = normalize_text("")
+
+    return dict(
+        verse,
+        translation=translation["text"],
+        translation_search=translation["search"],
+        footnote_markers=translation["markers"],
+        footnote_list=footnotes,
+        tafsir=tafsir["text"],
+        tafsir_id=int(banner.group(1)) if banner and banner.group(1) else verse.get("tafsir_id"),
+        tafsir_search=tafsir["search"],
+    )
+
+
+def normalize_chapter(chapter_no, verses):
+    """Normalize all verses of one chapter; runs inside a worker process"""
+    return chapter_no, [normalize_verse(verse) for verse in verses]
+
+
+class NormalizationStage:
+    """Process pool that normalizes whole chapters alongside an import"""
+
+    def __init__(self, workers=NORMALIZER_WORKERS):
+        self.workers = workers
+        self.executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel=exc_type is not None)
+        return False
+
+    def start(self):
+        """Start the worker processes"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, chapter_no, verses):
+        """Queue a chapter and return a future of (chapter_no, normalized verses)"""
+        self.start()
+        return self.executor.submit(normalize_chapter, chapter_no, verses)
+
+    def map_chapters(self, chapters):
+        """Normalize {chapter_no: verses} and yield results in chapter order"""
+        self.start()
+        chapter_numbers = sorted(chapters)
+        yield from self.executor.map(normalize_chapter, chapter_numbers,
+                                     [chapters[number] for number in chapter_numbers])
+
+    def shutdown(self, cancel=False):
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=cancel)
+            self.executor = None
+
+
+def edition_file_chapters(path):
+    """Read an edition file into {chapter_no: [verse dicts]} for normalization"""
+    with open(path, 'r', encoding='utf-8') as f:
+        edition = json.load(f)
+
+    chapters = {}
+    for verse_key, verse in edition.get("vs", {}).items():
+        translations = verse.get("tr") or []
+        chapters.setdefault(int(verse["c"]), []).append({
+            "verse_key": verse_key,
+            "translation": translations[0].get("t", "") if translations else "",
+            "tafsir": (verse.get("tf") or {}).get("t", ""),
+        })
+    return chapters
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python tafsir_text_normalizer.py EDITION.json OUTPUT.json")
+        sys.exit(1)
+
+    chapters = edition_file_chapters(sys.argv[1])
+    normalized = {}
+    with NormalizationStage() as stage:
+        for chapter_no, verses in stage.map_chapters(chapters):
+            for verse in verses:
+                normalized[verse["verse_key"]] = verse
+            if SHOW_PROGRESS and chapter_no % 20 == 0:
+                print(f"   ✅ Normalized chapter {chapter_no}/114")
+
+    with open(sys.argv[2], 'w', encoding='utf-8') as f:
+        json.dump(normalized, f, ensure_ascii=False, indent=2)
+    print(f"🎉 Normalized {len(normalized)} verses into '{sys.argv[2]}'")
@@ -0,0 +1,31 @@
+import pytest
+
+from batch_verse_lookup import parse_references, index_runs
+from quran_index import verse_to_global
+
+
+def test_single_verse():
+    assert parse_references("2:255") == [verse_to_global(2, 255)]
+
+
+@pytest.mark.parametrize("text", ["2:2555", "2:2551", "3:18-20x", "2:255-", "2:255x", "2:20-1", "1:8", "115"])
+def test_rejects_malformed_references(text):
+    with pytest.raises(ValueError):
+        parse_references(text)
+
+
+def test_duplicates_and_overlaps_are_merged():
+    indexes = parse_references("2:255, 2:255; 2:254-256 2:255")
+    assert indexes == [verse_to_global(2, 254), verse_to_global(2, 255), verse_to_global(2, 256)]
+
+
+def test_cross_chapter_range():
+    indexes = parse_references("2:285-3:5")
+    assert indexes == list(range(verse_to_global(2, 285), verse_to_global(3, 5) + 1))
+    assert len(indexes) == 7
+    assert index_runs(indexes) == [(verse_to_global(2, 285), verse_to_global(3, 5) + 1)]
+
+
+def test_mixed_references_and_lists():
+    assert parse_references(["1:1", " 1:2 ", "112"]) == [0, 1] + list(range(verse_to_global(112, 1),
+                                                                               verse_to_global(112, 4) + 1))